@@ -0,0 +1,328 @@
+import argparse
+import http.server
+import json
+import os
+import random
+import shutil
+import string
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import List, Dict, Any, Optional, Callable
+
+from main import HermesMonitor, RateController, UserAccount, TRENDING_SPEC, SEARCH_SPEC, SUGGESTED_SPEC
+
+ALPHABET = string.ascii_lowercase + string.digits
+
+HIGHER_IS_BETTER = ("items_per_sec", "requests_per_sec")
+LOWER_IS_BETTER = ("p50_ms", "p99_ms", "peak_mb")
+
+
+def random_username(rng: random.Random) -> str:
+    length = rng.choice((3, 4, 4, 5, 6, 8, 10, 12))
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def trending_payload(rng: random.Random, items: int) -> Dict[str, Any]:
+    item_list = []
+    for _ in range(items):
+        video_id = str(rng.randrange(10 ** 18, 10 ** 19))
+        item_list.append({
+            "id": video_id,
+            "desc": "synthetic item " + "x" * rng.randrange(20, 200),
+            "createTime": int(time.time()),
+            "video": {"id": video_id, "height": 1024, "width": 576, "duration": rng.randrange(5, 60),
+                      "cover": "https://example.invalid/cover.jpg", "playAddr": "https://example.invalid/play"},
+            "author": {"id": str(rng.randrange(10 ** 17, 10 ** 18)), "uniqueId": random_username(rng),
+                       "nickname": "nick", "avatarThumb": "https://example.invalid/avatar.jpg",
+                       "signature": "bio " * 10, "verified": rng.random() < 0.05},
+            "music": {"id": str(rng.randrange(10 ** 17, 10 ** 18)), "title": "original sound",
+                      "authorName": "someone", "original": True},
+            "stats": {"diggCount": rng.randrange(10 ** 6), "shareCount": rng.randrange(10 ** 4),
+                      "commentCount": rng.randrange(10 ** 4), "playCount": rng.randrange(10 ** 7)},
+            "authorStats": {"followerCount": rng.randrange(10 ** 7), "followingCount": rng.randrange(1000),
+                            "heartCount": rng.randrange(10 ** 8), "videoCount": rng.randrange(1000)}
+        })
+    return {"itemList": item_list, "hasMore": True, "cursor": str(items)}
+
+
+def user_payload(rng: random.Random, items: int, nested: bool) -> Dict[str, Any]:
+    user_list = []
+    for _ in range(items):
+        user = {"id": str(rng.randrange(10 ** 17, 10 ** 18)), "uniqueId": random_username(rng),
+                "nickname": "nick", "avatarThumb": "https://example.invalid/avatar.jpg",
+                "signature": "bio " * 10, "verified": rng.random() < 0.05,
+                "followerCount": rng.randrange(10 ** 7)}
+        user_list.append({"user": user, "stats": {"followerCount": user["followerCount"]}} if nested else user)
+    return {"userList": user_list, "hasMore": True, "cursor": items}
+
+
+class StubTikTokServer:
+    def __init__(self, items: int = 30, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 rate_limit_ratio: float = 0.0, pool: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.payloads = {
+            "/api/recommend/item_list/": [json.dumps(trending_payload(rng, items)).encode() for _ in range(pool)],
+            "/api/search/user/full/": [json.dumps(user_payload(rng, items, True)).encode() for _ in range(pool)],
+            "/api/recommend/user/list/": [json.dumps(user_payload(rng, items, False)).encode() for _ in range(pool)]
+        }
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.rate_limit_ratio = rate_limit_ratio
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._server: Optional[http.server.ThreadingHTTPServer] = None
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> "StubTikTokServer":
+        stub = self
+
+        class StubHandler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                stub._handle(self)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _handle(self, handler: http.server.BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.requests += 1
+            limited = random.random() < self.rate_limit_ratio
+            if limited:
+                self.rate_limited += 1
+
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        path = handler.path.split("?")[0]
+        pool = self.payloads.get(path)
+        if pool is None:
+            status, body, headers = 404, b"{}", {}
+        elif limited:
+            status, body, headers = 429, b"", {"Retry-After": "0"}
+        else:
+            status, body, headers = 200, random.choice(pool), {}
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def measure(name: str, operations: int, items: int, run: Callable[[], None], samples: List[float]) -> Dict[str, Any]:
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+
+    return {
+        "name": name,
+        "operations": operations,
+        "seconds": round(elapsed, 4),
+        "requests_per_sec": round(operations / elapsed, 2) if elapsed else 0.0,
+        "items_per_sec": round(items / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 4),
+        "p99_ms": round(percentile(samples, 99) * 1000, 4),
+        "peak_mb": round(peak / 1024 / 1024, 3)
+    }
+
+
+def timed(samples: List[float], func: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    result = func()
+    samples.append(time.perf_counter() - start)
+    return result
+
+
+def discard_logs(monitor: HermesMonitor) -> None:
+    def drain() -> None:
+        while True:
+            monitor.log_queue.get()
+
+    threading.Thread(target=drain, daemon=True).start()
+
+
+def build_monitor(api_base: str, save_file: str, history: int, seed: int = 2) -> HermesMonitor:
+    monitor = HermesMonitor()
+    discard_logs(monitor)
+    monitor.api_base = api_base
+    monitor.response_cache.enabled = False
+    monitor.max_pages = 1
+    monitor.rate_controller = RateController(initial_rate=1e6, min_rate=1e6, max_rate=1e6)
+    monitor._set_save_file(save_file)
+
+    rng = random.Random(seed)
+    monitor.store.add_many(UserAccount(
+        username="".join(rng.choices(ALPHABET, k=rng.choice((4, 5, 5, 5)))),
+        followers=rng.randrange(10 ** 7)
+    ) for _ in range(history))
+    monitor.store.flush()
+    if hasattr(monitor.store, "journal"):
+        monitor.store.journal.wait()
+    return monitor
+
+
+def run_suite(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    stub = StubTikTokServer(items=args.items, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           rate_limit_ratio=args.rate_limit_ratio).start()
+    results = []
+    workdir = tempfile.mkdtemp(prefix="hermes_bench_")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+
+    try:
+        specs = ((TRENDING_SPEC, "_trending_request", ()), (SEARCH_SPEC, "_search_request", ("bench",)),
+                 (SUGGESTED_SPEC, "_suggested_request", ()))
+
+        for history in args.history:
+            save_file = f"history_{history}{'.db' if args.backend == 'sqlite' else '.json'}"
+            tracemalloc.start()
+            monitor = build_monitor(stub.api_base, save_file, history)
+            held = tracemalloc.get_traced_memory()[0]
+            print(f"History {history:,} ({args.backend}) seeded, {held / 1024 / 1024:.1f} MB held", file=sys.stderr)
+
+            for spec, builder, builder_args in specs:
+                url, params = getattr(monitor, builder)(*builder_args)
+                samples: List[float] = []
+                run = lambda: [timed(samples, lambda: monitor.make_request(url, params))
+                               for _ in range(args.requests)]
+                result = measure(f"make_request[{spec.source}]", args.requests, args.requests * args.items,
+                                 run, samples)
+                results.append(dict(result, history=history))
+
+                pages = [monitor.decoder.decode(body).get(spec.list_key, []) for body in
+                         stub.payloads[f"/api/{spec.endpoint}/"][:args.pages]]
+                samples = []
+                run = lambda: [timed(samples, lambda: monitor.extract_targets(page, spec)) for page in pages]
+                result = measure(f"extract_targets[{spec.source}]", len(pages), sum(map(len, pages)), run, samples)
+                results.append(dict(result, history=history))
+
+            usernames = ["".join(random.choice(ALPHABET) for _ in range(monitor.target_length))
+                         for _ in range(args.items)]
+            samples = []
+            run = lambda: [timed(samples, lambda: monitor.store.filter_new(usernames)) for _ in range(args.pages)]
+            results.append(dict(measure("dedup", args.pages, args.pages * args.items, run, samples), history=history))
+
+            samples = []
+
+            def persist() -> None:
+                for _ in range(args.pages):
+                    monitor.store.add(UserAccount("".join(random.choice(ALPHABET) for _ in range(5))))
+                    timed(samples, monitor._save_results)
+
+            results.append(dict(measure("save_results", args.pages, args.pages, persist, samples), history=history))
+
+            samples = []
+            checks = (monitor.check_trending_posts, lambda: monitor.check_search_results("bench"),
+                      monitor.check_suggested_users)
+            run = lambda: [timed(samples, check) for _ in range(args.requests // 3 or 1) for check in checks]
+            cycles = (args.requests // 3 or 1) * 3
+            results.append(dict(measure("end_to_end", cycles, cycles * args.items, run, samples), history=history))
+
+            monitor.store.close()
+            tracemalloc.stop()
+    finally:
+        tracemalloc.stop()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+        stub.stop()
+
+    print(f"Stub served {stub.requests} requests ({stub.rate_limited} rate limited)", file=sys.stderr)
+    return results
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    header = f"{'benchmark':<32}{'history':>10}{'req/s':>12}{'items/s':>14}{'p50 ms':>10}{'p99 ms':>10}{'peak MB':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['name']:<32}{r['history']:>10,}{r['requests_per_sec']:>12,.1f}{r['items_per_sec']:>14,.0f}"
+              f"{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}{r['peak_mb']:>10.2f}")
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    previous = {(r["name"], r["history"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        base = previous.get((r["name"], r["history"]))
+        if base is None:
+            continue
+        for key in HIGHER_IS_BETTER:
+            if base[key] and r[key] < base[key] * (1 - tolerance):
+                regressions.append(f"{r['name']} @ {r['history']:,}: {key} {r[key]} < baseline {base[key]}")
+        for key in LOWER_IS_BETTER:
+            if base[key] and r[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{r['name']} @ {r['history']:,}: {key} {r[key]} > baseline {base[key]}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline Hermes benchmarks against a local stub TikTok API")
+    parser.add_argument("--items", type=int, default=30, help="items per synthetic page")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--pages", type=int, default=64, help="pages for extraction, dedup and save benchmarks")
+    parser.add_argument("--history", type=int, nargs="+", default=[10_000, 100_000],
+                        help="found-user history sizes to seed (e.g. 10000 100000 1000000)")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stub server latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="uniform jitter added to the latency")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--save", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a previous --save file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression vs baseline")
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nPerformance regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
-import requests
+from __future__ import annotations
+
 import time
 import json
 import re
@@ -7,61 +8,252 @@ import os
 import sys
 import threading
 import queue
-from datetime import datetime
-from typing import List, Dict, Any, Optional
-
-try:
-    from colorama import init, Fore, Back, Style
-    init(autoreset=True)  
-except ImportError:
-    print("Installing required package: colorama")
-    os.system('pip install colorama')
-    from colorama import init, Fore, Back, Style
+import heapq
+import bisect
+import itertools
+import math
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable, Union, NamedTuple, Callable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import argparse
+    import asyncio
+    import http.server
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    import requests
+
+
+class _NoColor:
+    def __getattr__(self, name: str) -> str:
+        return ""
+
+
+Fore = Back = Style = _NoColor()
+
+
+def init_colors() -> None:
+    global Fore, Back, Style
+    try:
+        from colorama import init, Fore, Back, Style
+    except ImportError:
+        print("Installing required package: colorama")
+        os.system('pip install colorama')
+        from colorama import init, Fore, Back, Style
     init(autoreset=True)
 
-HERMES_LOGO = f"""
+
+def hermes_logo() -> str:
+    return f"""
 {Fore.CYAN}╦ ╦╔═╗╦═╗╔╦╗╔═╗╔═╗{Style.RESET_ALL}  {Fore.YELLOW}⚡{Style.RESET_ALL}
 {Fore.CYAN}╠═╣║╣ ╠╦╝║║║║╣ ╚═╗{Style.RESET_ALL}  TikTok Username Monitor
 {Fore.CYAN}╩ ╩╚═╝╩╚═╩ ╩╚═╝╚═╝{Style.RESET_ALL}  v1.0.0
 """
 
 class Proxy:
+    __slots__ = ('ip', 'port', 'username', 'password', '_proxy_dict')
+
     def __init__(self, ip: str, port: int, username: Optional[str] = None, password: Optional[str] = None):
         self.ip = ip
         self.port = port
         self.username = username
         self.password = password
 
+        if self.username and self.password:
+            url = f"http://{self.username}:{self.password}@{self.ip}:{self.port}"
+        else:
+            url = f"http://{self.ip}:{self.port}"
+        self._proxy_dict = {"http": url, "https": url}
+
     @property
     def proxy_dict(self) -> Dict[str, str]:
-        if self.username and self.password:
-            return {
-                "http": f"http://{self.username}:{self.password}@{self.ip}:{self.port}",
-                "https": f"http://{self.username}:{self.password}@{self.ip}:{self.port}"
-            }
-        return {
-            "http": f"http://{self.ip}:{self.port}",
-            "https": f"http://{self.ip}:{self.port}"
-        }
+        return self._proxy_dict
 
     def __str__(self) -> str:
         return f"{self.ip}:{self.port}"
 
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://www.tiktok.com/',
+    'Origin': 'https://www.tiktok.com'
+}
+
+
+def create_session(pool_size: int = 10, proxy: Optional[Proxy] = None) -> requests.Session:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if proxy is not None:
+        session.proxies.update(proxy.proxy_dict)
+    return session
+
+
+class ProxyState:
+    __slots__ = ('proxy', 'session', 'latency', 'requests', 'errors', 'failures', 'down_until')
+
+    def __init__(self, proxy: Proxy, session: requests.Session):
+        self.proxy = proxy
+        self.session = session
+        self.latency: Optional[float] = None
+        self.requests = 0
+        self.errors = 0
+        self.failures = 0
+        self.down_until = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        return (self.requests - self.errors + 1) / (self.requests + 2)
+
+    @property
+    def weight(self) -> float:
+        return self.success_rate / max(self.latency if self.latency is not None else 1.0, 0.05)
+
+
+class ProxyPool:
+    def __init__(self, proxies: List[Proxy], pool_size: int = 10, failure_threshold: int = 3,
+                 cooldown: float = 30.0, max_cooldown: float = 600.0, smoothing: float = 0.2):
+        self.states = [ProxyState(proxy, create_session(pool_size, proxy)) for proxy in proxies]
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    @property
+    def healthy(self) -> int:
+        now = time.monotonic()
+        return sum(1 for state in self.states if state.down_until <= now)
+
+    def select(self, current: Optional[ProxyState] = None) -> ProxyState:
+        now = time.monotonic()
+        with self._lock:
+            available = [state for state in self.states if state.down_until <= now]
+            if not available:
+                return min(self.states, key=lambda state: state.down_until)
+            if len(available) > 1 and current in available:
+                available.remove(current)
+            return random.choices(available, weights=[state.weight for state in available])[0]
+
+    def observe(self, state: ProxyState, latency: Optional[float], ok: bool) -> bool:
+        with self._lock:
+            state.requests += 1
+            if latency is not None:
+                state.latency = latency if state.latency is None else \
+                    state.latency + self.smoothing * (latency - state.latency)
+            if ok:
+                state.failures = 0
+                return False
+
+            state.errors += 1
+            state.failures += 1
+            if state.failures < self.failure_threshold:
+                return False
+            backoff = self.cooldown * 2 ** (state.failures - self.failure_threshold)
+            state.down_until = time.monotonic() + min(self.max_cooldown, backoff)
+            return True
+
+    def close(self) -> None:
+        for state in self.states:
+            state.session.close()
+
+
 class UserAccount:
+    __slots__ = ('username', 'nickname', 'followers', 'verified', 'discovered_at', 'video_id', 'tags',
+                 '_profile_url', '_video_url')
+
     def __init__(self, username: str, nickname: str = "", followers: int = 0, 
                  profile_url: str = "", video_url: str = "", 
-                 verified: bool = False, discovery_time: datetime = None):
-        self.username = username.strip('@') if username else ""
+                 verified: bool = False, discovery_time: datetime = None,
+                 video_id: str = "", discovered_at: Optional[int] = None, tags: Tuple[str, ...] = ()):
+        self.username = sys.intern(username.strip('@')) if username else ""
         self.nickname = nickname
         self.followers = followers
-        self.profile_url = profile_url or f"https://www.tiktok.com/@{self.username}"
-        self.video_url = video_url
         self.verified = verified
-        self.discovery_time = discovery_time or datetime.now()
+        self.video_id = video_id
+        self.tags = tuple(tags)
+        self._profile_url = None
+        self._video_url = None
+        self.profile_url = profile_url
+        self.video_url = video_url
+
+        if discovered_at is not None:
+            self.discovered_at = int(discovered_at)
+        else:
+            self.discovery_time = discovery_time or datetime.now()
+
+    @property
+    def profile_url(self) -> str:
+        return self._profile_url or f"https://www.tiktok.com/@{self.username}"
+
+    @profile_url.setter
+    def profile_url(self, value: str) -> None:
+        self._profile_url = value if value and value != f"https://www.tiktok.com/@{self.username}" else None
+
+    @property
+    def video_url(self) -> str:
+        if self._video_url is not None:
+            return self._video_url
+        return f"https://www.tiktok.com/@{self.username}/video/{self.video_id}" if self.video_id else ""
+
+    @video_url.setter
+    def video_url(self, value: str) -> None:
+        prefix = f"https://www.tiktok.com/@{self.username}/video/"
+        if value.startswith(prefix):
+            self.video_id = value[len(prefix):]
+            self._video_url = None
+        else:
+            self._video_url = value or None
+
+    @property
+    def discovery_time(self) -> datetime:
+        return datetime.fromtimestamp(self.discovered_at)
+
+    @discovery_time.setter
+    def discovery_time(self, value: datetime) -> None:
+        self.discovered_at = int(value.timestamp())
 
     def __str__(self) -> str:
         return f"@{self.username}"
 
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'username': self.username,
+            'nickname': self.nickname,
+            'followers': self.followers,
+            'profile_url': self.profile_url,
+            'video_url': self.video_url,
+            'verified': self.verified,
+            'discovery_time': self.discovery_time.isoformat()
+        }
+        if self.tags:
+            data['tags'] = list(self.tags)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UserAccount":
+        discovery_time = datetime.fromisoformat(data.get('discovery_time', datetime.now().isoformat()))
+        return cls(
+            username=data.get('username', ''),
+            nickname=data.get('nickname', ''),
+            followers=_as_int(data.get('followers')),
+            profile_url=data.get('profile_url', ''),
+            video_url=data.get('video_url', ''),
+            verified=data.get('verified', False),
+            discovery_time=discovery_time,
+            tags=data.get('tags', ())
+        )
+
     def format_details(self) -> str:
         verified_badge = f"{Fore.CYAN}[✓]{Style.RESET_ALL} " if self.verified else ""
         return (
@@ -70,8 +262,14 @@ class UserAccount:
             f"  {Fore.GREEN}Followers:{Style.RESET_ALL} {self.format_number(self.followers)}\n"
             f"  {Fore.GREEN}Profile:{Style.RESET_ALL} {self.profile_url}\n"
             f"  {Fore.GREEN}Discovered:{Style.RESET_ALL} {self.discovery_time.strftime('%Y-%m-%d %H:%M:%S')}"
+            + (f"\n  {Fore.GREEN}Matched:{Style.RESET_ALL} {', '.join(self.tags)}" if self.tags else "")
         )
 
+    def format_line(self) -> str:
+        return (f"  @{self.username}{' [verified]' if self.verified else ''} | {self.nickname} | "
+                f"{self.format_number(self.followers)} followers | {self.profile_url}"
+                + (f" | matched {', '.join(self.tags)}" if self.tags else ""))
+
     @staticmethod
     def format_number(num: int) -> str:
         if num >= 1_000_000_000:
@@ -82,37 +280,2311 @@ class UserAccount:
             return f"{num/1_000:.1f}K"
         return str(num)
 
-class HermesMonitor:
+class ExtractSpec(NamedTuple):
+    source: str
+    endpoint: str
+    list_key: str
+    user_path: Tuple[str, ...]
+    stats_path: Tuple[str, ...]
+    with_video: bool = False
+
+    def flattened(self) -> "ExtractSpec":
+        return self._replace(user_path=(), stats_path=())
+
+
+TRENDING_SPEC = ExtractSpec("trending", "recommend/item_list", "itemList", ("author",), ("authorStats",), with_video=True)
+SEARCH_SPEC = ExtractSpec("search", "search/user/full", "userList", ("user",), ("user",))
+SUGGESTED_SPEC = ExtractSpec("suggested", "recommend/user/list", "userList", (), ())
+
+
+TARGET_PATTERNS = {
+    "alnum": (r"[^\W_]{%d}", r"[^\W_]{%d}"),
+    "letters": (r"[^\W\d_]{%d}", r"[^\W\d_]{%d}"),
+    "digits": (r"\d{%d}", r"\d{%d}"),
+    "repeated": (r"[^\W_]{%d}", r"(?=([^\W_]))\1{%d}")
+}
+
+
+class TargetSpec(NamedTuple):
+    length: int
+    pattern: str = "alnum"
+
+    @property
+    def name(self) -> str:
+        return str(self.length) if self.pattern == "alnum" else f"{self.length}:{self.pattern}"
+
+    @property
+    def gate(self) -> str:
+        return TARGET_PATTERNS[self.pattern][0] % self.length
+
+    @property
+    def regex(self) -> str:
+        return TARGET_PATTERNS[self.pattern][1] % self.length
+
+    @classmethod
+    def parse(cls, text: Union[str, Iterable[str]]) -> List["TargetSpec"]:
+        tokens = text.split(',') if isinstance(text, str) else text
+        specs: Dict[str, TargetSpec] = {}
+        for token in tokens:
+            lengths, _, pattern = str(token).strip().partition(':')
+            pattern = pattern.strip() or "alnum"
+            if pattern not in TARGET_PATTERNS:
+                raise ValueError(f"Unknown pattern '{pattern}' (choose from {', '.join(TARGET_PATTERNS)})")
+            low, _, high = lengths.partition('-')
+            for length in range(int(low), int(high or low) + 1):
+                if not 3 <= length <= 5:
+                    raise ValueError(f"Invalid length {length}. Please choose between 3 and 5.")
+                spec = cls(length, pattern)
+                specs[spec.name] = spec
+        if not specs:
+            raise ValueError("No target specs given")
+        return list(specs.values())
+
+
+def _walk(item: Any, path: Tuple[str, ...]) -> Dict:
+    for key in path:
+        if not isinstance(item, dict):
+            return {}
+        item = item.get(key)
+    return item if isinstance(item, dict) else {}
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+class JsonDecoder:
+    _FIELD_RE = re.compile(
+        rb'"(uniqueId|nickname|followerCount|verified)":\s*("(?:[^"\\]|\\.)*"|-?\d+|true|false)'
+        rb'|"video":\s*\{\s*"id":\s*"(\d+)"'
+    )
+    _PAGE_RE = re.compile(rb'"(hasMore|has_more|cursor)":\s*("(?:[^"\\]|\\.)*"|-?\d+|true|false)')
+
+    def __init__(self, selective: bool = False):
+        self.backend, self._loads = self._pick_backend()
+        self.selective = selective
+        self.decode_count = 0
+        self.decode_time = 0.0
+        self.last_decode_time = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _pick_backend() -> Tuple[str, Any]:
+        try:
+            import orjson
+            return "orjson", orjson.loads
+        except ImportError:
+            pass
+        try:
+            import ujson
+            return "ujson", ujson.loads
+        except ImportError:
+            pass
+        return "json", json.loads
+
+    @property
+    def average_ms(self) -> float:
+        return (self.decode_time / self.decode_count) * 1000 if self.decode_count else 0.0
+
+    def decode(self, raw: bytes) -> Dict:
+        start = time.perf_counter()
+        try:
+            return self._select(raw) if self.selective else self._loads(raw)
+        except ValueError as e:
+            if isinstance(e, json.JSONDecodeError):
+                raise
+            raise json.JSONDecodeError(str(e), raw[:100].decode('utf-8', 'replace'), 0)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.last_decode_time = elapsed
+                self.decode_time += elapsed
+                self.decode_count += 1
+
+    def _select(self, raw: bytes) -> Dict:
+        records = []
+        current: Optional[Dict[str, Any]] = None
+        video_id = None
+
+        for match in self._FIELD_RE.finditer(raw):
+            key, value, video = match.groups()
+            if video is not None:
+                video_id = video.decode()
+                continue
+
+            if key == b'uniqueId':
+                current = {'uniqueId': self._loads(value)}
+                if video_id is not None:
+                    current['id'] = video_id
+                    video_id = None
+                records.append(current)
+            elif current is not None:
+                name = key.decode()
+                if name not in current:
+                    current[name] = self._loads(value)
+
+        if not records and not raw.lstrip().startswith(b'{'):
+            raise json.JSONDecodeError("Expecting object", raw[:100].decode('utf-8', 'replace'), 0)
+
+        data: Dict[str, Any] = {TRENDING_SPEC.list_key: records, SEARCH_SPEC.list_key: records}
+        for match in self._PAGE_RE.finditer(raw):
+            key, value = match.groups()
+            data.setdefault('cursor' if key == b'cursor' else 'hasMore', self._loads(value))
+        return data
+
+
+class ResultJournal:
+    def __init__(self, snapshot_file: str, compact_every: int = 1000):
+        self.snapshot_file = snapshot_file
+        base = os.path.splitext(snapshot_file)[0]
+        self.journal_file = base + ".jsonl"
+        self.rotated_file = self.journal_file + ".1"
+        self.index_file = base + ".idx"
+        self.compact_every = compact_every
+        self.entries_since_compaction = 0
+        self._handle = None
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.entries_since_compaction >= self.compact_every
+
+    @property
+    def compacting(self) -> bool:
+        return self._compactor is not None and self._compactor.is_alive()
+
+    @property
+    def exists(self) -> bool:
+        return any(os.path.exists(path) for path in (self.snapshot_file, self.journal_file, self.rotated_file))
+
+    def load(self) -> Tuple[List[str], List[Dict[str, Any]]]:
+        usernames: List[str] = []
+        records: List[Dict[str, Any]] = []
+
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'r') as f:
+                data = json.load(f)
+            usernames.extend(data.get('usernames', []))
+            records.extend(data.get('users', []))
+
+        seen = set(usernames)
+        for record in self._iter_journals(count=True):
+            username = record.get('username', '')
+            if username and username not in seen:
+                seen.add(username)
+                usernames.append(username)
+                records.append(record)
+
+        return usernames, records
+
+    def load_usernames(self) -> List[str]:
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r') as f:
+                usernames = f.read().split()
+        elif os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'r') as f:
+                usernames = json.load(f).get('usernames', [])
+            self._write_index(usernames)
+        else:
+            usernames = []
+
+        seen = set(usernames)
+        for record in self._iter_journals(count=True):
+            username = record.get('username', '')
+            if username and username not in seen:
+                seen.add(username)
+                usernames.append(username)
+
+        return usernames
+
+    def load_journal_usernames(self) -> List[str]:
+        return [record['username'] for record in self._iter_journals(count=True) if record.get('username')]
+
+    def iter_records(self, include_live: bool = True) -> Iterator[Dict[str, Any]]:
+        journals = self._iter_journals() if include_live else self._read_journal(self.rotated_file)
+        seen = set()
+        for record in itertools.chain(self._iter_snapshot(), journals):
+            username = record.get('username', '')
+            if username and username not in seen:
+                seen.add(username)
+                yield record
+
+    def _iter_snapshot(self) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(self.snapshot_file):
+            return
+
+        with open(self.snapshot_file, 'r') as f:
+            header = f.readline()
+            if not header.rstrip().endswith('"users":['):
+                f.seek(0)
+                yield from json.load(f).get('users', [])
+                return
+
+            for line in f:
+                line = line.strip().rstrip(',')
+                if not line or line.startswith(']'):
+                    break
+                yield json.loads(line)
+
+    def _iter_journals(self, count: bool = False) -> Iterator[Dict[str, Any]]:
+        yield from self._read_journal(self.rotated_file)
+        for record in self._read_journal(self.journal_file):
+            if count:
+                self.entries_since_compaction += 1
+            yield record
+
+    @staticmethod
+    def _read_journal(path: str) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    @staticmethod
+    def _torn(path: str) -> bool:
+        try:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            return False
+
+    def append(self, users: List[UserAccount]) -> None:
+        if not users:
+            return
+
+        lines = "".join(json.dumps(user.to_dict(), separators=(',', ':')) + "\n" for user in users)
+        with self._lock:
+            if self._handle is None:
+                if self._torn(self.journal_file):
+                    lines = "\n" + lines
+                self._handle = open(self.journal_file, 'a')
+            self._handle.write(lines)
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self.entries_since_compaction += len(users)
+
+    def compact(self, usernames: Iterable[str], users: Optional[List[UserAccount]], background: bool = True) -> bool:
+        with self._lock:
+            if self.compacting:
+                return False
+
+            self._close_handle()
+            if os.path.exists(self.journal_file):
+                if os.path.exists(self.rotated_file):
+                    torn = self._torn(self.rotated_file)
+                    with open(self.journal_file, 'r') as src, open(self.rotated_file, 'a') as dst:
+                        dst.write(("\n" if torn else "") + src.read())
+                    os.remove(self.journal_file)
+                else:
+                    os.replace(self.journal_file, self.rotated_file)
+            self.entries_since_compaction = 0
+
+            if background:
+                self._compactor = threading.Thread(target=self._write_snapshot, args=(usernames, users))
+                self._compactor.start()
+                return True
+
+        self._write_snapshot(usernames, users)
+        return True
+
+    def _write_snapshot(self, usernames: Iterable[str], users: Optional[List[UserAccount]]) -> None:
+        usernames = list(usernames)
+        if users is None:
+            records = self.iter_records(include_live=False)
+        else:
+            records = (user.to_dict() for user in users)
+
+        tmp_file = self.snapshot_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            f.write('{"last_updated":%s,"usernames":%s,"users":[\n' % (
+                json.dumps(datetime.now().isoformat()), json.dumps(usernames, separators=(',', ':'))))
+            separator = ""
+            for record in records:
+                f.write(separator + json.dumps(record, separators=(',', ':')))
+                separator = ",\n"
+            f.write("\n]}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+        self._write_index(usernames)
+
+        if os.path.exists(self.rotated_file):
+            os.remove(self.rotated_file)
+
+    def _write_index(self, usernames: List[str]) -> None:
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            f.write("\n".join(usernames))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.index_file)
+
+    def clear(self) -> None:
+        self.wait()
+        with self._lock:
+            self._close_handle()
+            for path in (self.journal_file, self.rotated_file):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.entries_since_compaction = 0
+        self._write_snapshot([], [])
+
+    def wait(self) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def close(self) -> None:
+        self.wait()
+        with self._lock:
+            self._close_handle()
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+BITMAP_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+BITMAP_MAGIC = b"HRMSBMP1"
+
+
+def _popcount(data: bytes) -> int:
+    value = int.from_bytes(data, 'little')
+    return value.bit_count() if hasattr(value, 'bit_count') else bin(value).count('1')
+
+
+class UsernameBitmap:
+    _HEADER = 16
+
+    def __init__(self, path: str, min_length: int = 3, max_length: int = 5):
+        import mmap
+
+        self.path = path
+        self.overflow_file = path + ".overflow"
+        self.min_length = min_length
+        self.max_length = max_length
+        self._offsets: Dict[int, int] = {}
+        self.size = 0
+        for length in range(min_length, max_length + 1):
+            self._offsets[length] = self.size
+            self.size += len(BITMAP_ALPHABET) ** length
+        self._nonzero = re.compile(rb'[^\x00]')
+
+        header = BITMAP_MAGIC + bytes((min_length, max_length)) + bytes(self._HEADER - len(BITMAP_MAGIC) - 2)
+        nbytes = self._HEADER + (self.size + 7) // 8
+        self.created = not self._valid(header, nbytes)
+        if self.created:
+            with open(path, 'wb') as f:
+                f.write(header)
+                f.truncate(nbytes)
+
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), nbytes)
+        self._overflow = set() if self.created else self._load_overflow()
+        self._pending = set()
+        self.counts = {length: self._count_range(offset, offset + len(BITMAP_ALPHABET) ** length)
+                       for length, offset in self._offsets.items()}
+
+    def _valid(self, header: bytes, nbytes: int) -> bool:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) != nbytes:
+            return False
+        with open(self.path, 'rb') as f:
+            return f.read(len(header)) == header
+
+    def _load_overflow(self) -> set:
+        if not os.path.exists(self.overflow_file):
+            return set()
+        with open(self.overflow_file, 'r') as f:
+            return set(f.read().split())
+
+    def __len__(self) -> int:
+        return sum(self.counts.values()) + len(self._overflow) + len(self._pending)
+
+    def __contains__(self, username: str) -> bool:
+        rank = self.rank(username)
+        if rank is not None and self._map[self._HEADER + (rank >> 3)] >> (rank & 7) & 1:
+            return True
+        return username in self._pending or (rank is None and username in self._overflow)
+
+    def __iter__(self) -> Iterator[str]:
+        return itertools.chain(self._iter_ranks(), list(self._overflow))
+
+    def _iter_ranks(self) -> Iterator[str]:
+        for match in self._nonzero.finditer(self._map, self._HEADER):
+            byte = self._map[match.start()]
+            base = (match.start() - self._HEADER) << 3
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield self.name(base + bit)
+
+    def rank(self, username: str) -> Optional[int]:
+        offset = self._offsets.get(len(username))
+        if offset is None or not (username.isascii() and username.isalnum()):
+            return None
+        if not (username.islower() or username.isdigit()):
+            return None
+        return offset + int(username, 36)
+
+    def name(self, rank: int) -> str:
+        length = next(length for length in range(self.max_length, self.min_length - 1, -1)
+                      if rank >= self._offsets[length])
+        value = rank - self._offsets[length]
+        chars = []
+        for _ in range(length):
+            value, digit = divmod(value, len(BITMAP_ALPHABET))
+            chars.append(BITMAP_ALPHABET[digit])
+        return "".join(reversed(chars))
+
+    def add(self, username: str) -> bool:
+        if username in self:
+            return False
+        self._pending.add(username)
+        return True
+
+    def update(self, usernames: Iterable[str]) -> None:
+        for username in usernames:
+            self.add(username)
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, set()
+        overflow = []
+        for username in pending:
+            rank = self.rank(username)
+            if rank is None:
+                overflow.append(username)
+                continue
+            index = self._HEADER + (rank >> 3)
+            self._map[index] = self._map[index] | (1 << (rank & 7))
+            self.counts[len(username)] += 1
+        self._map.flush()
+
+        if overflow:
+            with open(self.overflow_file, 'a') as f:
+                f.write("".join(username + "\n" for username in overflow))
+                f.flush()
+                os.fsync(f.fileno())
+            self._overflow.update(overflow)
+
+    def _count_range(self, start: int, end: int) -> int:
+        if start >= end:
+            return 0
+        first = self._HEADER + (start >> 3)
+        last = self._HEADER + ((end - 1) >> 3)
+        if first == last:
+            mask = ((1 << (end - start)) - 1) << (start & 7)
+            return bin(self._map[first] & mask).count('1')
+        head = self._map[first] >> (start & 7)
+        tail = self._map[last] & ((1 << (((end - 1) & 7) + 1)) - 1)
+        return bin(head).count('1') + bin(tail).count('1') + _popcount(self._map[first + 1:last])
+
+    def coverage(self, prefix: str = "", length: Optional[int] = None) -> Tuple[int, int]:
+        if re.fullmatch(r'[0-9a-z]*', prefix) is None:
+            return 0, 0
+
+        seen = total = 0
+        for size in ([length] if length else self._offsets):
+            if size not in self._offsets or size < len(prefix):
+                continue
+            span = len(BITMAP_ALPHABET) ** (size - len(prefix))
+            if prefix:
+                start = self._offsets[size] + int(prefix, 36) * span
+                seen += self._count_range(start, start + span)
+            else:
+                seen += self.counts[size]
+            total += span
+        return seen, total
+
+    def clear(self) -> None:
+        self._map[self._HEADER:] = bytes(len(self._map) - self._HEADER)
+        self._map.flush()
+        self._overflow = set()
+        self._pending = set()
+        self.counts = dict.fromkeys(self.counts, 0)
+        if os.path.exists(self.overflow_file):
+            os.remove(self.overflow_file)
+
+    def close(self) -> None:
+        self.flush()
+        self._map.close()
+        self._file.close()
+
+
+def _matches(username: str, is_verified: bool, length: Optional[int], verified: bool) -> bool:
+    return (not length or len(username) == length) and (not verified or bool(is_verified))
+
+
+class MemoryResultStore:
+    def __init__(self, save_file: str, lazy: bool = False):
+        self.save_file = save_file
+        self.lazy = lazy
+        self.journal = ResultJournal(save_file)
+        self.usernames = UsernameBitmap(os.path.splitext(save_file)[0] + ".bitmap")
+        self.users: List[UserAccount] = []
+        self._unsaved: List[UserAccount] = []
+        self._by_followers: List[Tuple[int, str, UserAccount]] = []
+        self._filtered: Dict[Tuple[Optional[int], bool], List[Tuple[int, str, UserAccount]]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.usernames)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self.usernames
+
+    def load(self) -> int:
+        if not self.journal.exists:
+            self.usernames.clear()
+
+        if self.lazy:
+            if self.usernames.created:
+                self.usernames.update(self.journal.load_usernames())
+            else:
+                self.usernames.update(self.journal.load_journal_usernames())
+            self.users = []
+        else:
+            usernames, records = self.journal.load()
+            self.usernames.update(usernames)
+            self.users = [UserAccount.from_dict(record) for record in records]
+        self._by_followers = sorted((-user.followers, user.username, user) for user in self.users)
+        self._filtered = {}
+        self.usernames.flush()
+        return len(self.usernames)
+
+    def coverage(self, prefix: str = "", length: Optional[int] = None) -> Tuple[int, int]:
+        with self._lock:
+            return self.usernames.coverage(prefix, length)
+
+    def filter_new(self, usernames: Iterable[str]) -> set:
+        candidates = set(usernames)
+        with self._lock:
+            return {username for username in candidates if username not in self.usernames}
+
+    def add(self, user: UserAccount) -> bool:
+        return bool(self.add_many([user]))
+
+    def add_many(self, users: Iterable[UserAccount]) -> List[UserAccount]:
+        with self._lock:
+            added = []
+            for user in users:
+                if user.username in self.usernames:
+                    continue
+                user.followers = _as_int(user.followers)
+                self.usernames.add(user.username)
+                self._unsaved.append(user)
+                added.append(user)
+
+            if added and not self.lazy:
+                self.users.extend(added)
+                entries = [(-user.followers, user.username, user) for user in added]
+                self._index(self._by_followers, entries)
+                for (length, verified), index in self._filtered.items():
+                    self._index(index, [entry for entry in entries
+                                        if _matches(entry[1], entry[2].verified, length, verified)])
+            return added
+
+    @staticmethod
+    def _index(index: List[Tuple[int, str, UserAccount]], entries: List[Tuple[int, str, UserAccount]]) -> None:
+        if len(entries) > 8:
+            index.extend(entries)
+            index.sort()
+        else:
+            for entry in entries:
+                bisect.insort(index, entry)
+
+    def flush(self) -> int:
+        with self._lock:
+            users, self._unsaved = self._unsaved, []
+            self.journal.append(users)
+            self.usernames.flush()
+
+            if self.journal.needs_compaction:
+                self.journal.compact(list(self.usernames), None if self.lazy else list(self.users))
+            return len(users)
+
+    def iter_by_followers(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[UserAccount]:
+        if not self.lazy:
+            end = None if limit is None else offset + limit
+            with self._lock:
+                entries = self._by_followers[offset:end]
+            return (entry[2] for entry in entries)
+
+        self.flush()
+        key = lambda record: record.get('followers', 0)
+        if limit is None:
+            records = sorted(self.journal.iter_records(), key=key, reverse=True)[offset:]
+        else:
+            records = heapq.nlargest(offset + limit, self.journal.iter_records(), key=key)[offset:]
+        return (UserAccount.from_dict(record) for record in records)
+
+    def page_by_followers(self, offset: int, limit: int, length: Optional[int] = None,
+                          verified: bool = False) -> Tuple[List[UserAccount], int]:
+        if not self.lazy:
+            with self._lock:
+                index = self._by_followers
+                if length or verified:
+                    index = self._filtered.get((length, verified))
+                    if index is None:
+                        index = self._filtered[(length, verified)] = [
+                            entry for entry in self._by_followers if _matches(entry[1], entry[2].verified, length, verified)
+                        ]
+                return [entry[2] for entry in index[offset:offset + limit]], len(index)
+
+        self.flush()
+        total = 0
+
+        def matching() -> Iterator[Dict[str, Any]]:
+            nonlocal total
+            for record in self.journal.iter_records():
+                if _matches(record.get('username', ''), record.get('verified', False), length, verified):
+                    total += 1
+                    yield record
+
+        records = heapq.nlargest(offset + limit, matching(), key=lambda record: record.get('followers', 0))
+        return [UserAccount.from_dict(record) for record in records[offset:]], total
+
+    def iter_since(self, start: int = 0, end: Optional[int] = None) -> Iterator[UserAccount]:
+        if not self.lazy:
+            users = self.users
+            for index in range(len(users)):
+                user = users[index]
+                if user.discovered_at >= start and (end is None or user.discovered_at < end):
+                    yield user
+            return
+
+        self.flush()
+        for record in self.journal.iter_records():
+            user = UserAccount.from_dict(record)
+            if user.discovered_at >= start and (end is None or user.discovered_at < end):
+                yield user
+
+    def clear(self) -> None:
+        with self._lock:
+            self.journal.clear()
+            self.usernames.clear()
+            self.users = []
+            self._unsaved = []
+            self._by_followers = []
+            self._filtered = {}
+
+    def close(self) -> None:
+        self.flush()
+        self.journal.close()
+        self.usernames.close()
+
+
+class SqliteResultStore:
+    def __init__(self, db_file: str):
+        import sqlite3
+
+        self.save_file = db_file
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY,
+                nickname TEXT NOT NULL DEFAULT '',
+                followers INTEGER NOT NULL DEFAULT 0,
+                profile_url TEXT NOT NULL DEFAULT '',
+                video_url TEXT NOT NULL DEFAULT '',
+                verified INTEGER NOT NULL DEFAULT 0,
+                discovery_time INTEGER NOT NULL,
+                tags TEXT NOT NULL DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS idx_users_followers ON users (followers DESC);
+            CREATE INDEX IF NOT EXISTS idx_users_discovery_time ON users (discovery_time);
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(users)")}
+        if 'tags' not in columns:
+            self._conn.execute("ALTER TABLE users ADD COLUMN tags TEXT NOT NULL DEFAULT ''")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._count = 0
+        self._dirty = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, username: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone()
+        return row is not None
+
+    def load(self) -> int:
+        with self._lock:
+            self._count = self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        return self._count
+
+    def coverage(self, prefix: str = "", length: Optional[int] = None) -> Tuple[int, int]:
+        if re.fullmatch(r'[0-9a-z]*', prefix) is None:
+            return 0, 0
+
+        seen = total = 0
+        for size in ([length] if length else range(3, 6)):
+            if size < len(prefix):
+                continue
+            with self._lock:
+                seen += self._conn.execute(
+                    "SELECT COUNT(*) FROM users WHERE length(username) = ? AND substr(username, 1, ?) = ? "
+                    "AND username NOT GLOB '*[^0-9a-z]*'", (size, len(prefix), prefix)
+                ).fetchone()[0]
+            total += len(BITMAP_ALPHABET) ** (size - len(prefix))
+        return seen, total
+
+    def filter_new(self, usernames: Iterable[str]) -> set:
+        pending = list(set(usernames))
+        known = set()
+        with self._lock:
+            for i in range(0, len(pending), 500):
+                chunk = pending[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT username FROM users WHERE username IN ({','.join('?' * len(chunk))})", chunk
+                )
+                known.update(row[0] for row in rows)
+        return set(pending) - known
+
+    def add(self, user: UserAccount) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO users (username, nickname, followers, profile_url, video_url, verified, "
+                "discovery_time, tags) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (user.username, user.nickname, user.followers, user._profile_url or '', user.video_url,
+                 int(user.verified), user.discovered_at, ",".join(user.tags))
+            )
+            added = cursor.rowcount == 1
+            if added:
+                self._count += 1
+                self._dirty += 1
+        return added
+
+    def add_many(self, users: Iterable[UserAccount]) -> List[UserAccount]:
+        return [user for user in users if self.add(user)]
+
+    def flush(self) -> int:
+        with self._lock:
+            saved, self._dirty = self._dirty, 0
+            self._conn.commit()
+        return saved
+
+    def iter_by_followers(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[UserAccount]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT username, nickname, followers, profile_url, video_url, verified, discovery_time, tags "
+                "FROM users ORDER BY followers DESC LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset)
+            )
+
+        while True:
+            with self._lock:
+                batch = rows.fetchmany(500)
+            if not batch:
+                break
+            for row in batch:
+                yield self._row_to_user(row)
+
+    def page_by_followers(self, offset: int, limit: int, length: Optional[int] = None,
+                          verified: bool = False) -> Tuple[List[UserAccount], int]:
+        conditions, args = [], []
+        if length:
+            conditions.append("length(username) = ?")
+            args.append(length)
+        if verified:
+            conditions.append("verified = 1")
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT username, nickname, followers, profile_url, video_url, verified, discovery_time, tags "
+                f"FROM users{where} ORDER BY followers DESC LIMIT ? OFFSET ?", (*args, limit, offset)
+            ).fetchall()
+            total = self._conn.execute(f"SELECT COUNT(*) FROM users{where}", args).fetchone()[0] if where else self._count
+        return [self._row_to_user(row) for row in rows], total
+
+    def iter_since(self, start: int = 0, end: Optional[int] = None) -> Iterator[UserAccount]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT username, nickname, followers, profile_url, video_url, verified, discovery_time, tags "
+                "FROM users WHERE discovery_time >= ? AND discovery_time < ? ORDER BY discovery_time",
+                (start, (1 << 62) if end is None else end)
+            )
+
+        while True:
+            with self._lock:
+                batch = rows.fetchmany(500)
+            if not batch:
+                break
+            for row in batch:
+                yield self._row_to_user(row)
+
+    @staticmethod
+    def _row_to_user(row: Tuple) -> UserAccount:
+        return UserAccount(
+            username=row[0],
+            nickname=row[1],
+            followers=row[2],
+            profile_url=row[3],
+            video_url=row[4],
+            verified=bool(row[5]),
+            discovered_at=row[6],
+            tags=tuple(tag for tag in row[7].split(',') if tag)
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM users")
+            self._conn.commit()
+            self._count = 0
+            self._dirty = 0
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+class RemoteResultStore:
+    def __init__(self, url: str):
+        self.save_file = url.rstrip('/')
+        self.worker_id: Optional[int] = None
+        self._count = 0
+        self._session = None
+        self._lock = threading.Lock()
+        self._reporter: Optional[threading.Thread] = None
+        self._reporter_stop = threading.Event()
+
+    def _call(self, method: str, path: str, payload: Optional[Dict] = None, params: Optional[Dict] = None) -> Any:
+        with self._lock:
+            if self._session is None:
+                import requests
+                self._session = requests.Session()
+            response = self._session.request(method, self.save_file + path, json=payload, params=params, timeout=30)
+        if response.status_code == 409:
+            raise RuntimeError(f"Coordinator refused: {response.json().get('error')}")
+        response.raise_for_status()
+        return response.json()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, username: str) -> bool:
+        return not self.filter_new([username])
+
+    def register(self) -> Dict[str, Any]:
+        shard = self._call("POST", "/register", {"pid": os.getpid()})
+        self.worker_id = shard["worker"]
+        return shard
+
+    def load(self) -> int:
+        self._count = self._call("GET", "/count")["count"]
+        return self._count
+
+    def coverage(self, prefix: str = "", length: Optional[int] = None) -> Tuple[int, int]:
+        seen, total = self._call("GET", "/coverage", params={"prefix": prefix, "length": length or ""})
+        return seen, total
+
+    def filter_new(self, usernames: Iterable[str]) -> set:
+        return set(self._call("POST", "/filter", {"usernames": list(set(usernames))})["new"])
+
+    def add(self, user: UserAccount) -> bool:
+        return bool(self.add_many([user]))
+
+    def add_many(self, users: Iterable[UserAccount]) -> List[UserAccount]:
+        pending = {user.username: user for user in users}
+        if not pending:
+            return []
+        result = self._call("POST", "/claim", {"worker": self.worker_id,
+                                               "users": [user.to_dict() for user in pending.values()]})
+        self._count = result["count"]
+        return [pending[username] for username in result["added"]]
+
+    def flush(self) -> int:
+        return 0
+
+    def iter_by_followers(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[UserAccount]:
+        records = self._call("GET", "/users", params={"offset": offset, "limit": "" if limit is None else limit})
+        return (UserAccount.from_dict(record) for record in records)
+
+    def page_by_followers(self, offset: int, limit: int, length: Optional[int] = None,
+                          verified: bool = False) -> Tuple[List[UserAccount], int]:
+        page = self._call("GET", "/page", params={"offset": offset, "limit": limit, "length": length or "",
+                                                  "verified": int(verified)})
+        return [UserAccount.from_dict(record) for record in page["users"]], page["total"]
+
+    def iter_since(self, start: int = 0, end: Optional[int] = None) -> Iterator[UserAccount]:
+        records = self._call("GET", "/users", params={"start": start, "end": "" if end is None else end})
+        return (UserAccount.from_dict(record) for record in records)
+
+    def report_stats(self, snapshot: Dict[str, Any]) -> bool:
+        counters = {key: snapshot.get(key, 0) for key in ("requests", "usernames_checked", "rate_limited_count")}
+        return not self._call("POST", "/stats", {"worker": self.worker_id, "stats": counters}).get("released")
+
+    def report_every(self, stats: "Stats", interval: float = 10.0,
+                     on_released: Optional[Callable[[], None]] = None) -> None:
+        self._reporter_stop = threading.Event()
+
+        def report_loop(stop_event: threading.Event) -> None:
+            while True:
+                stopped = stop_event.wait(interval)
+                try:
+                    held = self.report_stats(stats.snapshot())
+                except Exception:
+                    held = True
+                if not held and on_released is not None:
+                    on_released()
+                    return
+                if stopped:
+                    return
+
+        self._reporter = threading.Thread(target=report_loop, args=(self._reporter_stop,),
+                                          name="hermes-stats-report", daemon=True)
+        self._reporter.start()
+
+    def close(self) -> None:
+        if self._reporter is not None:
+            self._reporter_stop.set()
+            self._reporter.join(timeout=10)
+            self._reporter = None
+
+
+ResultStore = Union[MemoryResultStore, SqliteResultStore, RemoteResultStore]
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+
+def open_result_store(save_file: str, lazy: bool = False) -> ResultStore:
+    if save_file.lower().startswith(('http://', 'https://')):
+        return RemoteResultStore(save_file)
+    if save_file.lower().endswith(SQLITE_EXTENSIONS):
+        return SqliteResultStore(save_file)
+    return MemoryResultStore(save_file, lazy=lazy)
+
+
+EXPORT_FORMATS = ("txt", "csv", "jsonl", "jsonl.gz", "jsonl.zst")
+EXPORT_COLUMNS = ("username", "nickname", "followers", "verified", "profile_url", "video_url", "discovery_time", "tags")
+
+
+def export_format(path: str) -> str:
+    name = path.lower()
+    for fmt in sorted(EXPORT_FORMATS, key=len, reverse=True):
+        if name.endswith('.' + fmt):
+            return fmt
+    return "txt"
+
+
+class ResultExporter:
+    def __init__(self, store: ResultStore, watermark_file: str):
+        self.store = store
+        self.watermark_file = watermark_file
+
+    def watermarks(self) -> Dict[str, int]:
+        if not os.path.exists(self.watermark_file):
+            return {}
+        with open(self.watermark_file, 'r') as f:
+            return json.load(f)
+
+    def _save_watermark(self, name: str, value: int) -> None:
+        watermarks = self.watermarks()
+        watermarks[name] = value
+        tmp_file = self.watermark_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(watermarks, f, indent=2)
+        os.replace(tmp_file, self.watermark_file)
+
+    @staticmethod
+    def _open(path: str, fmt: str) -> Any:
+        if fmt == "jsonl.gz":
+            import gzip
+            return gzip.open(path, 'wt', encoding='utf-8', newline='')
+        if fmt == "jsonl.zst":
+            try:
+                import zstandard
+            except ImportError:
+                raise ValueError("zstd export needs the zstandard package (pip install zstandard)")
+            import io
+            return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(path, 'wb')),
+                                    encoding='utf-8', newline='')
+        return open(path, 'w', encoding='utf-8', newline='')
+
+    def export(self, path: str, fmt: Optional[str] = None, since_last: Optional[str] = None) -> int:
+        fmt = fmt or export_format(path)
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}' (choose from {', '.join(EXPORT_FORMATS)})")
+
+        end = None
+        if since_last:
+            start = self.watermarks().get(since_last, 0)
+            end = int(time.time())
+            users = self.store.iter_since(start, end)
+        elif fmt == "txt":
+            users = self.store.iter_by_followers()
+        else:
+            users = self.store.iter_since()
+
+        tmp_file = path + ".tmp"
+        with self._open(tmp_file, fmt) as f:
+            count = self._write(f, fmt, users, since_last)
+        os.replace(tmp_file, path)
+
+        if since_last:
+            self._save_watermark(since_last, end)
+        return count
+
+    def _write(self, f: Any, fmt: str, users: Iterator[UserAccount], since_last: Optional[str]) -> int:
+        count = 0
+        if fmt == "csv":
+            import csv
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_COLUMNS)
+            for count, user in enumerate(users, 1):
+                writer.writerow((user.username, user.nickname, user.followers, int(user.verified), user.profile_url,
+                                 user.video_url, user.discovery_time.isoformat(), ";".join(user.tags)))
+        elif fmt == "txt":
+            f.write(f"# Hermes TikTok Username Monitor - Export\n")
+            f.write(f"# Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"# Total usernames: {len(self.store)}\n")
+            if since_last:
+                f.write(f"# New since last '{since_last}' export\n")
+            f.write("\n")
+
+            for count, user in enumerate(users, 1):
+                f.write(f"@{user.username}\n"
+                        f"Nickname: {user.nickname}\n"
+                        f"Followers: {user.followers}\n"
+                        f"Profile: {user.profile_url}\n"
+                        f"Discovered: {user.discovery_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                        + "-" * 40 + "\n")
+        else:
+            for count, user in enumerate(users, 1):
+                f.write(json.dumps(user.to_dict(), separators=(',', ':')) + "\n")
+        return count
+
+
+def endpoint_name(url: str) -> str:
+    path = urlparse(url).path.strip('/')
+    return path[len('api/'):] if path.startswith('api/') else path
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class EndpointRate:
+    __slots__ = ('rate', 'next_allowed', 'successes', 'rate_limited')
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.next_allowed = 0.0
+        self.successes = 0
+        self.rate_limited = 0
+
+
+class RateController:
+    def __init__(self, initial_rate: float = 0.2, min_rate: float = 1 / 120, max_rate: float = 1.0,
+                 increase: float = 0.01, decrease: float = 0.5):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._base_rates = (initial_rate, max_rate)
+        self._endpoints: Dict[str, EndpointRate] = {}
+        self._lock = threading.Lock()
+
+    def set_budget(self, requests_per_second: float) -> None:
+        with self._lock:
+            initial_rate, max_rate = self._base_rates
+            self.initial_rate = max(initial_rate, requests_per_second)
+            self.max_rate = max(max_rate, requests_per_second)
+            for state in self._endpoints.values():
+                state.rate = min(state.rate, self.max_rate)
+
+    def _state(self, endpoint: str) -> EndpointRate:
+        state = self._endpoints.get(endpoint)
+        if state is None:
+            state = self._endpoints[endpoint] = EndpointRate(self.initial_rate)
+        return state
+
+    def rate(self, endpoint: str) -> float:
+        with self._lock:
+            return self._state(endpoint).rate
+
+    def delay(self, endpoint: str) -> float:
+        with self._lock:
+            return max(0.0, self._state(endpoint).next_allowed - time.monotonic())
+
+    def reserve(self, endpoint: str) -> float:
+        with self._lock:
+            state = self._state(endpoint)
+            now = time.monotonic()
+            slot = max(now, state.next_allowed)
+            state.next_allowed = slot + 1 / state.rate
+            return slot - now
+
+    def on_success(self, endpoint: str) -> None:
+        with self._lock:
+            state = self._state(endpoint)
+            state.successes += 1
+            state.rate = min(self.max_rate, state.rate + self.increase)
+
+    def on_rate_limited(self, endpoint: str, retry_after: Optional[float] = None) -> float:
+        with self._lock:
+            state = self._state(endpoint)
+            state.rate_limited += 1
+            state.rate = max(self.min_rate, state.rate * self.decrease)
+            wait = retry_after if retry_after is not None else 1 / state.rate
+            state.next_allowed = max(state.next_allowed, time.monotonic() + wait)
+            return wait
+
+
+class RetryPolicy:
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 10.0):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, failures: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (failures - 1)))
+
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half-open"
+CIRCUIT_STATES = (CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN)
+
+
+class EndpointCircuit:
+    __slots__ = ('state', 'failures', 'opened_at', 'probing', 'opens')
+
     def __init__(self):
-        self.session = self._create_session()
-        self.user_agents = self._load_user_agents()
-        self.proxies: List[Proxy] = []
-        self.current_proxy_index = 0
-        self.found_usernames = set()
-        self.found_users: List[UserAccount] = []
-        self.target_length = 4  
-        self.running = False
-        self.save_file = "hermes_found_usernames.json"
-        self.stats = {
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.opens = 0
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._endpoints: Dict[str, EndpointCircuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, endpoint: str) -> EndpointCircuit:
+        circuit = self._endpoints.get(endpoint)
+        if circuit is None:
+            circuit = self._endpoints[endpoint] = EndpointCircuit()
+        return circuit
+
+    def allow(self, endpoint: str) -> bool:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state == CIRCUIT_CLOSED:
+                return True
+            if circuit.state == CIRCUIT_OPEN:
+                if time.monotonic() < circuit.opened_at + self.reset_timeout:
+                    return False
+                circuit.state = CIRCUIT_HALF_OPEN
+                circuit.probing = False
+            if circuit.probing:
+                return False
+            circuit.probing = True
+            return True
+
+    def retry_after(self, endpoint: str) -> float:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit.state != CIRCUIT_OPEN:
+                return 0.0
+            return max(0.0, circuit.opened_at + self.reset_timeout - time.monotonic())
+
+    def on_success(self, endpoint: str) -> bool:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            closed = circuit.state != CIRCUIT_CLOSED
+            circuit.state = CIRCUIT_CLOSED
+            circuit.failures = 0
+            circuit.probing = False
+            return closed
+
+    def on_failure(self, endpoint: str) -> bool:
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit.failures += 1
+            circuit.probing = False
+            if circuit.state == CIRCUIT_HALF_OPEN or (
+                    circuit.state == CIRCUIT_CLOSED and circuit.failures >= self.failure_threshold):
+                circuit.state = CIRCUIT_OPEN
+                circuit.opened_at = time.monotonic()
+                circuit.opens += 1
+                return True
+            return False
+
+    def release(self, endpoint: str) -> None:
+        with self._lock:
+            self._circuit(endpoint).probing = False
+
+    def state(self, endpoint: str) -> str:
+        with self._lock:
+            return self._circuit(endpoint).state
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            return {endpoint: circuit.state for endpoint, circuit in self._endpoints.items()}
+
+
+class CacheEntry:
+    __slots__ = ('digest', 'fetched_at', 'ttl', 'unchanged')
+
+    def __init__(self, digest: int, fetched_at: float):
+        self.digest = digest
+        self.fetched_at = fetched_at
+        self.ttl = 0.0
+        self.unchanged = 0
+
+
+class ResponseCache:
+    def __init__(self, min_ttl: float = 60.0, max_ttl: float = 1800.0, backoff: float = 2.0):
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.backoff = backoff
+        self.enabled = True
+        self.skipped = 0
+        self.unchanged = 0
+        self.changed = 0
+        self._entries: Dict[Tuple, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict]) -> Tuple:
+        return endpoint_name(url), tuple(sorted((params or {}).items()))
+
+    @staticmethod
+    def digest(items: List[Dict], spec: ExtractSpec) -> int:
+        return hash(frozenset(_walk(item, spec.user_path).get('uniqueId') for item in items))
+
+    def due(self, key: Tuple) -> bool:
+        if not self.enabled:
+            return True
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry.fetched_at + entry.ttl:
+                return True
+            self.skipped += 1
+            return False
+
+    def next_refresh(self, key: Tuple) -> float:
+        with self._lock:
+            entry = self._entries.get(key)
+            return max(0.0, entry.fetched_at + entry.ttl - time.monotonic()) if entry else 0.0
+
+    def update(self, key: Tuple, digest: int) -> bool:
+        if not self.enabled:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.digest != digest:
+                self._entries[key] = CacheEntry(digest, now)
+                self.changed += 1
+                return True
+
+            entry.fetched_at = now
+            entry.unchanged += 1
+            entry.ttl = min(self.max_ttl, max(self.min_ttl, entry.ttl * self.backoff))
+            self.unchanged += 1
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class YieldArm:
+    __slots__ = ('name', 'requests', 'authors', 'hits', 'pulls', 'total_requests', 'total_hits')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0.0
+        self.authors = 0.0
+        self.hits = 0.0
+        self.pulls = 0
+        self.total_requests = 0
+        self.total_hits = 0
+
+    @property
+    def hits_per_request(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    @property
+    def authors_per_request(self) -> float:
+        return self.authors / self.requests if self.requests else 0.0
+
+
+class YieldScheduler:
+    def __init__(self, decay: float = 0.8, exploration: float = 0.3, author_weight: float = 0.01,
+                 max_seen_authors: int = 500_000):
+        self.decay = decay
+        self.exploration = exploration
+        self.author_weight = author_weight
+        self.max_seen_authors = max_seen_authors
+        self.pulls = 0
+        self.new_authors = 0
+        self._arms: Dict[str, YieldArm] = {}
+        self._seen_authors: set = set()
+        self._lock = threading.Lock()
+
+    def add(self, name: str) -> None:
+        with self._lock:
+            if name not in self._arms:
+                self._arms[name] = YieldArm(name)
+
+    def observe_authors(self, usernames: Iterable[Optional[str]]) -> int:
+        candidates = set(usernames)
+        candidates.discard(None)
+        with self._lock:
+            new = candidates - self._seen_authors
+            if len(self._seen_authors) + len(new) > self.max_seen_authors:
+                self._seen_authors = set()
+            self._seen_authors |= new
+            self.new_authors += len(new)
+        return len(new)
+
+    def score(self, arm: YieldArm) -> float:
+        if not arm.pulls:
+            return float('inf')
+        value = (arm.hits + self.author_weight * arm.authors) / arm.requests if arm.requests else 0.0
+        return value + self.exploration * (2 * math.log(max(self.pulls, 1)) / arm.pulls) ** 0.5
+
+    def choose(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        excluded = set(exclude)
+        with self._lock:
+            candidates = [arm for name, arm in self._arms.items() if name not in excluded]
+            if not candidates:
+                return None
+            return max(candidates, key=lambda arm: (self.score(arm), -arm.pulls)).name
+
+    def record(self, name: str, requests: int, authors: int, hits: int) -> None:
+        with self._lock:
+            arm = self._arms[name]
+            arm.requests = arm.requests * self.decay + requests
+            arm.authors = arm.authors * self.decay + authors
+            arm.hits = arm.hits * self.decay + hits
+            arm.total_requests += requests
+            arm.total_hits += hits
+            if requests:
+                arm.pulls += 1
+                self.pulls += 1
+
+    def ranking(self) -> List[YieldArm]:
+        with self._lock:
+            return sorted(self._arms.values(), key=lambda arm: (arm.hits_per_request, arm.authors_per_request),
+                          reverse=True)
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class EndpointMetrics:
+    __slots__ = ('latency_buckets', 'latency_sum', 'latency_count', 'status_codes', 'response_bytes',
+                 'decode_sum', 'decode_count', 'pages', 'items', 'hits', 'retries', 'circuit')
+
+    def __init__(self):
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.status_codes: Dict[int, int] = {}
+        self.response_bytes = 0
+        self.decode_sum = 0.0
+        self.decode_count = 0
+        self.pages = 0
+        self.items = 0
+        self.hits = 0
+        self.retries = 0
+        self.circuit = CIRCUIT_CLOSED
+
+
+class Metrics:
+    def __init__(self):
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[http.server.ThreadingHTTPServer] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_stop = threading.Event()
+
+    def _endpoint(self, endpoint: str) -> EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def observe_request(self, endpoint: str, latency: float, status_code: int, response_bytes: int) -> None:
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            bucket = bisect.bisect_left(LATENCY_BUCKETS, latency)
+            if bucket < len(LATENCY_BUCKETS):
+                metrics.latency_buckets[bucket] += 1
+            metrics.latency_sum += latency
+            metrics.latency_count += 1
+            metrics.status_codes[status_code] = metrics.status_codes.get(status_code, 0) + 1
+            metrics.response_bytes += response_bytes
+
+    def observe_decode(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics.decode_sum += seconds
+            metrics.decode_count += 1
+
+    def observe_page(self, endpoint: str, items: int, hits: int) -> None:
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics.pages += 1
+            metrics.items += items
+            metrics.hits += hits
+
+    def observe_retry(self, endpoint: str) -> None:
+        with self._lock:
+            self._endpoint(endpoint).retries += 1
+
+    def set_circuit(self, endpoint: str, state: str) -> None:
+        with self._lock:
+            self._endpoint(endpoint).circuit = state
+
+    def render(self) -> str:
+        lines = [
+            "# HELP hermes_request_duration_seconds Request latency per endpoint.",
+            "# TYPE hermes_request_duration_seconds histogram"
+        ]
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            for name, m in endpoints:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, m.latency_buckets):
+                    cumulative += count
+                    lines.append(f'hermes_request_duration_seconds_bucket{{endpoint="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'hermes_request_duration_seconds_bucket{{endpoint="{name}",le="+Inf"}} {m.latency_count}')
+                lines.append(f'hermes_request_duration_seconds_sum{{endpoint="{name}"}} {m.latency_sum:.6f}')
+                lines.append(f'hermes_request_duration_seconds_count{{endpoint="{name}"}} {m.latency_count}')
+
+            lines += ["# HELP hermes_responses_total Responses per endpoint and status code.",
+                      "# TYPE hermes_responses_total counter"]
+            for name, m in endpoints:
+                for code, count in sorted(m.status_codes.items()):
+                    lines.append(f'hermes_responses_total{{endpoint="{name}",code="{code}"}} {count}')
+
+            counters = (
+                ("hermes_response_bytes_total", "Response body bytes per endpoint.", lambda m: m.response_bytes),
+                ("hermes_decode_seconds_sum", "Time spent decoding JSON per endpoint.", lambda m: f"{m.decode_sum:.6f}"),
+                ("hermes_decode_seconds_count", "Decoded responses per endpoint.", lambda m: m.decode_count),
+                ("hermes_pages_total", "Pages run through extraction per endpoint.", lambda m: m.pages),
+                ("hermes_page_items_total", "Items seen on extracted pages per endpoint.", lambda m: m.items),
+                ("hermes_target_hits_total", "New target usernames found per endpoint.", lambda m: m.hits),
+                ("hermes_retries_total", "Transient failures retried per endpoint.", lambda m: m.retries)
+            )
+            for metric, help_text, value in counters:
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                lines += [f'{metric}{{endpoint="{name}"}} {value(m)}' for name, m in endpoints]
+
+            gauges = (
+                ("hermes_items_per_page", "Average items per extracted page.",
+                 lambda m: m.items / m.pages if m.pages else 0.0),
+                ("hermes_hit_rate", "New target usernames per item seen.",
+                 lambda m: m.hits / m.items if m.items else 0.0),
+                ("hermes_circuit_state", "Circuit breaker state per endpoint (0 closed, 1 half-open, 2 open).",
+                 lambda m: CIRCUIT_STATES.index(m.circuit))
+            )
+            for metric, help_text, value in gauges:
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+                lines += [f'{metric}{{endpoint="{name}"}} {value(m):.6f}' for name, m in endpoints]
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        tmp_file = path + ".tmp"
+        with open(tmp_file, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp_file, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> None:
+        import http.server
+
+        metrics = self
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split('?')[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.stop()
+        self._server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="hermes-metrics", daemon=True).start()
+
+    def flush_every(self, path: str, interval: float = 15.0) -> None:
+        self.stop()
+        self._flusher_stop = threading.Event()
+
+        def flush_loop(stop_event: threading.Event) -> None:
+            while not stop_event.wait(interval):
+                self.write(path)
+            self.write(path)
+
+        self._flusher = threading.Thread(target=flush_loop, args=(self._flusher_stop,),
+                                         name="hermes-metrics-file", daemon=True)
+        self._flusher.start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._flusher is not None:
+            self._flusher_stop.set()
+            self._flusher.join()
+            self._flusher = None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: "CycleProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        self.profiler._record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _Cycle:
+    __slots__ = ('profiler', 'source', 'start')
+
+    def __init__(self, profiler: "CycleProfiler", source: str):
+        self.profiler = profiler
+        self.source = source
+
+    def __enter__(self) -> "_Cycle":
+        self.profiler._begin_cycle()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        self.profiler._end_cycle(self.source, time.perf_counter() - self.start)
+        return False
+
+
+class CycleProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.output_dir: Optional[str] = None
+        self.dump_every = 10
+        self.cycles = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._profile: Optional[Any] = None
+        self._profile_lock = threading.Lock()
+        self._profiled_cycles = 0
+        self._started_tracemalloc = False
+
+    def enable(self, output_dir: str, dump_every: int = 10) -> None:
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.dump_every = max(1, dump_every)
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self._started_tracemalloc:
+            import tracemalloc
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def span(self, name: str) -> Union[_Span, _NullSpan]:
+        return _Span(self, name) if self.enabled else NULL_SPAN
+
+    def cycle(self, source: str) -> Union[_Cycle, _NullSpan]:
+        return _Cycle(self, source) if self.enabled else NULL_SPAN
+
+    def _record(self, name: str, seconds: float) -> None:
+        spans = getattr(self._local, 'spans', None)
+        if spans is not None:
+            spans[name] = spans.get(name, 0.0) + seconds
+
+    def _begin_cycle(self) -> None:
+        self._local.spans = {}
+        self._local.profiling = self._profile_lock.acquire(blocking=False)
+        if self._local.profiling:
+            if self._profile is None:
+                import cProfile
+                self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def _end_cycle(self, source: str, total: float) -> None:
+        profiling = self._local.profiling
+        if profiling:
+            self._profile.disable()
+        spans, self._local.spans = self._local.spans, None
+
+        with self._lock:
+            self.cycles += 1
+            cycle = self.cycles
+            record = {
+                'cycle': cycle,
+                'source': source,
+                'time': datetime.now().isoformat(),
+                'total': round(total, 6),
+                'spans': {name: round(seconds, 6) for name, seconds in spans.items()}
+            }
+            with open(os.path.join(self.output_dir, "cycles.jsonl"), 'a') as f:
+                f.write(json.dumps(record) + "\n")
+
+        if not profiling:
+            return
+        try:
+            self._profiled_cycles += 1
+            if self._profiled_cycles % self.dump_every == 0:
+                self._profile.dump_stats(os.path.join(self.output_dir, f"cycle_{cycle:06d}_{source}.prof"))
+                self._profile = None
+                import tracemalloc
+                if tracemalloc.is_tracing():
+                    tracemalloc.take_snapshot().dump(os.path.join(self.output_dir, f"cycle_{cycle:06d}.tracemalloc"))
+        finally:
+            self._profile_lock.release()
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.capacity = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class AsyncFetchEngine:
+    def __init__(self, monitor: "HermesMonitor", concurrency: int = 5, requests_per_second: float = 1.0):
+        self.monitor = monitor
+        self.concurrency = max(1, concurrency)
+        self.budget = TokenBucket(requests_per_second, burst=self.concurrency)
+
+    def fetch_many(self, jobs: List[Tuple[str, Dict]]) -> List[Dict]:
+        import asyncio
+        return asyncio.run(self._fetch_all(jobs))
+
+    async def _fetch_all(self, jobs: List[Tuple[str, Dict]]) -> List[Dict]:
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            import aiohttp
+        except ImportError:
+            aiohttp = None
+
+        if aiohttp is None:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                return await asyncio.gather(*(
+                    self._fetch_threaded(executor, semaphore, url, params) for url, params in jobs
+                ))
+
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, timeout=timeout) as session:
+            return await asyncio.gather(*(
+                self._fetch_aiohttp(aiohttp, session, semaphore, url, params) for url, params in jobs
+            ))
+
+    async def _acquire_budget(self) -> None:
+        import asyncio
+        delay = self.budget.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _fetch_threaded(self, executor: ThreadPoolExecutor, semaphore: asyncio.Semaphore,
+                              url: str, params: Dict) -> Dict:
+        import asyncio
+        async with semaphore:
+            await self._acquire_budget()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, self.monitor.make_request, url, params)
+
+    async def _fetch_aiohttp(self, aiohttp: Any, session: Any, semaphore: asyncio.Semaphore,
+                             url: str, params: Dict) -> Dict:
+        import asyncio
+        endpoint = endpoint_name(url)
+
+        async with semaphore:
+            rate_limited = failures = 0
+            while self.monitor._admit(endpoint):
+                await self._acquire_budget()
+                delay = self.monitor.rate_controller.reserve(endpoint)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                self.monitor._prepare_request()
+                context = self.monitor._context()
+                headers = {'User-Agent': context.user_agent}
+                proxy = context.proxy
+
+                try:
+                    start = time.perf_counter()
+                    async with session.get(url, params=params, headers=headers,
+                                           proxy=proxy.proxy.proxy_dict['https'] if proxy else None) as response:
+                        content = await response.read()
+                    latency = time.perf_counter() - start
+                    self.monitor.metrics.observe_request(endpoint, latency, response.status, len(content))
+                    self.monitor._observe_proxy(proxy, latency, response.status < 500 and response.status != 429)
+
+                    if response.status >= 500:
+                        error = f"Status code {response.status}"
+                    else:
+                        data = self.monitor._handle_response(endpoint, response.status, content, response.headers)
+                        self.monitor._record_success(endpoint)
+                        if data is not None:
+                            return data
+                        rate_limited += 1
+                        if rate_limited > self.monitor.max_rate_limit_retries:
+                            return {}
+                        continue
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = f"Request error: {str(e)}"
+                    self.monitor._observe_proxy(proxy, None, False)
+                except json.JSONDecodeError:
+                    error = "Invalid JSON response"
+
+                failures += 1
+                delay = self.monitor._record_failure(endpoint, error, failures)
+                if delay is None:
+                    return {}
+                await asyncio.sleep(delay)
+
+            return {}
+
+
+def shard_sources(sources: List[str], keywords: List[str], shards: int) -> List[Tuple[List[str], List[str]]]:
+    units = [source for source in sources if source != "keywords"]
+    if "keywords" in sources:
+        units += [f"keyword:{keyword}" for keyword in keywords]
+
+    count = max(1, min(shards, len(units)) if shards > 0 else len(units))
+    result = []
+    for shard in range(count):
+        assigned = units[shard::count]
+        shard_keywords = [unit.partition(':')[2] for unit in assigned if unit.startswith("keyword:")]
+        shard_sources = [unit for unit in assigned if not unit.startswith("keyword:")]
+        if shard_keywords:
+            shard_sources.append("keywords")
+        result.append((shard_sources, shard_keywords))
+    return result
+
+
+class Coordinator:
+    def __init__(self, monitor: "HermesMonitor", sources: List[str], keywords: List[str], shards: int,
+                 settings: Dict[str, Any]):
+        self.monitor = monitor
+        self.shards = shard_sources(sources, keywords, shards)
+        self.settings = settings
+        self.workers: Dict[int, Dict[str, Any]] = {}
+        self.stale_after = 45.0
+        self._taken: Dict[int, int] = {}
+        self._seen: Dict[int, float] = {}
+        self._pids: Dict[int, Optional[int]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[http.server.ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def register(self, pid: Optional[int] = None) -> Dict[str, Any]:
+        self.release_lost()
+        with self._lock:
+            free = [shard for shard in range(len(self.shards)) if shard not in self._taken]
+            if not free:
+                raise ValueError(f"all {len(self.shards)} shards are taken")
+            worker = len(self.workers) + 1
+            self._taken[free[0]] = worker
+            self._seen[worker] = time.monotonic()
+            self._pids[worker] = pid
+            sources, keywords = self.shards[free[0]]
+            self.workers[worker] = {"requests": 0, "usernames_checked": 0, "rate_limited_count": 0, "found": 0}
+        self.monitor.log(f"Worker {worker} registered: {', '.join(sources)}"
+                         + (f" ({', '.join(keywords)})" if keywords else ""), level="info")
+        return {
+            "worker": worker,
+            "sources": sources,
+            "keywords": keywords,
+            "targets": self.monitor.target_label.replace(' ', ''),
+            "interval": self.settings.get("interval"),
+            "max_pages": self.monitor.max_pages,
+            "requests_per_second": self.monitor.requests_per_second
+        }
+
+    def release_lost(self, exited_pids: Iterable[int] = ()) -> None:
+        exited = set(exited_pids)
+        now = time.monotonic()
+        with self._lock:
+            for shard, worker in list(self._taken.items()):
+                if self._pids.get(worker) in exited:
+                    reason = "exited"
+                elif now - self._seen[worker] > self.stale_after:
+                    reason = f"sent no stats for {self.stale_after:.0f}s"
+                else:
+                    continue
+                del self._taken[shard]
+                self.monitor.log(f"Worker {worker} {reason}, its shard ({', '.join(self.shards[shard][0])}) "
+                                 f"is free again", level="warning")
+
+    def _touch(self, worker: Optional[int]) -> bool:
+        if worker not in self._taken.values():
+            return False
+        self._seen[worker] = time.monotonic()
+        return True
+
+    def claim(self, worker: Optional[int], records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            self._touch(worker)
+        store = self.monitor.store
+        added = store.add_many(UserAccount.from_dict(record) for record in records)
+        if added:
+            store.flush()
+            with self._lock:
+                if worker in self.workers:
+                    self.workers[worker]["found"] += len(added)
+            names = ", ".join(f"@{user.username} [{', '.join(user.tags)}]" for user in added)
+            self.monitor.log(f"Worker {worker} found: {names}", level="success")
+        return {"added": [user.username for user in added], "count": len(store)}
+
+    def report(self, worker: Optional[int], stats: Dict[str, Any]) -> bool:
+        with self._lock:
+            if worker in self.workers:
+                for key in ("requests", "usernames_checked", "rate_limited_count"):
+                    self.workers[worker][key] = stats.get(key, 0)
+            return self._touch(worker)
+
+    def aggregate(self) -> Dict[str, int]:
+        with self._lock:
+            totals = {"workers": len(self._taken)}
+            for stats in self.workers.values():
+                for key, value in stats.items():
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        import http.server
+        from urllib.parse import parse_qs
+
+        coordinator = self
+        store = self.monitor.store
+
+        class CoordinatorHandler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, payload: Any, status: int = 200) -> None:
+                body = json.dumps(payload, separators=(',', ':')).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                path, _, query = self.path.partition('?')
+                params = {key: values[0] for key, values in parse_qs(query).items()}
+                if path == "/count":
+                    self._reply({"count": len(store)})
+                elif path == "/coverage":
+                    length = params.get("length")
+                    self._reply(list(store.coverage(params.get("prefix", ""), int(length) if length else None)))
+                elif path == "/page":
+                    length = params.get("length")
+                    users, total = store.page_by_followers(int(params.get("offset", 0)), int(params.get("limit", 10)),
+                                                           int(length) if length else None,
+                                                           params.get("verified") == "1")
+                    self._reply({"users": [user.to_dict() for user in users], "total": total})
+                elif path == "/users" and "start" in params:
+                    end = params.get("end")
+                    users = store.iter_since(int(params["start"]), int(end) if end else None)
+                    self._reply([user.to_dict() for user in users])
+                elif path == "/users":
+                    limit = params.get("limit")
+                    users = store.iter_by_followers(int(params.get("offset", 0)), int(limit) if limit else None)
+                    self._reply([user.to_dict() for user in users])
+                else:
+                    self._reply({"error": "not found"}, 404)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/register":
+                    try:
+                        self._reply(coordinator.register(payload.get("pid")))
+                    except ValueError as e:
+                        self._reply({"error": str(e)}, 409)
+                elif self.path == "/filter":
+                    self._reply({"new": sorted(store.filter_new(payload.get("usernames", [])))})
+                elif self.path == "/claim":
+                    self._reply(coordinator.claim(payload.get("worker"), payload.get("users", [])))
+                elif self.path == "/stats":
+                    held = coordinator.report(payload.get("worker"), payload.get("stats", {}))
+                    self._reply({"released": not held})
+                else:
+                    self._reply({"error": "not found"}, 404)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = http.server.ThreadingHTTPServer((host, port), CoordinatorHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="hermes-coordinator", daemon=True).start()
+
+    def run(self, workers: int, host: str = "127.0.0.1", port: int = 0, report_interval: float = 15.0) -> None:
+        import subprocess
+
+        if workers > len(self.shards):
+            self.monitor.log(f"Only {len(self.shards)} shards to hand out, starting {len(self.shards)} of "
+                             f"{workers} workers", level="warning")
+            workers = len(self.shards)
+
+        self.serve(host, port)
+        self.monitor.log(f"Coordinator listening on {self.url} with {len(self.shards)} shards", level="info")
+
+        command = [sys.executable, os.path.abspath(__file__), "worker", self.url]
+        if self.settings.get("proxies"):
+            command += ["--proxies", self.settings["proxies"]]
+        if self.settings.get("log_level"):
+            command += ["--log-level", self.settings["log_level"]]
+        processes = [subprocess.Popen(command) for _ in range(workers)]
+
+        self.monitor.running = True
+        start = time.monotonic()
+        try:
+            while self.monitor._wait(report_interval):
+                self.release_lost(process.pid for process in processes if process.poll() is not None)
+                self._log_aggregate(time.monotonic() - start)
+                if processes and all(process.poll() is not None for process in processes):
+                    self.monitor.log("All local workers exited", level="warning")
+                    break
+        finally:
+            self.monitor.stop()
+            for process in processes:
+                if process.poll() is None:
+                    process.terminate()
+            for process in processes:
+                try:
+                    process.wait(timeout=15)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            self._log_aggregate(time.monotonic() - start)
+            self.stop()
+
+    def _log_aggregate(self, elapsed: float) -> None:
+        totals = self.aggregate()
+        requests = totals.get('requests', 0)
+        self.monitor.log(f"Aggregate: {totals['workers']} workers, {requests} requests "
+                         f"({requests / elapsed * 60 if elapsed > 0 else 0:.1f} req/min), "
+                         f"{totals.get('usernames_checked', 0)} usernames checked, "
+                         f"{totals.get('rate_limited_count', 0)} rate limited, "
+                         f"{totals.get('found', 0)} found this run, {len(self.monitor.store)} total", level="info")
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.monitor.store.flush()
+
+
+LOG_LEVELS = {"debug": 10, "info": 20, "success": 25, "warning": 30, "error": 40}
+LOG_COLORS = {"error": "RED", "warning": "YELLOW", "info": "WHITE", "success": "GREEN", "debug": "CYAN"}
+
+LogRecord = Tuple[float, str, str]
+
+
+def _clock(timestamp: float, cache: Dict[int, str]) -> str:
+    second = int(timestamp)
+    text = cache.get(second)
+    if text is None:
+        cache.clear()
+        text = cache[second] = time.strftime("%H:%M:%S", time.localtime(second))
+    return text
+
+
+class ConsoleLogSink:
+    def __init__(self, stream: Any = None):
+        self.stream = stream
+        self._clock: Dict[int, str] = {}
+
+    def write(self, records: List[LogRecord]) -> None:
+        stream = self.stream or sys.stdout
+        reset = Style.RESET_ALL
+        stream.write("".join(
+            f"[{_clock(timestamp, self._clock)}] {getattr(Fore, LOG_COLORS.get(level, 'WHITE'))}{message}{reset}\n"
+            for timestamp, level, message in records
+        ))
+        stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class FileLogSink:
+    def __init__(self, path: str, fmt: str = "text", max_bytes: int = 10 * 1024 * 1024, backups: int = 3):
+        self.path = path
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._clock: Dict[int, str] = {}
+        self._handle = open(path, 'a', buffering=64 * 1024, encoding='utf-8')
+        self._size = self._handle.tell()
+
+    def _format(self, record: LogRecord) -> str:
+        timestamp, level, message = record
+        if self.fmt == "json":
+            return json.dumps({"time": datetime.fromtimestamp(timestamp).isoformat(timespec='milliseconds'),
+                               "level": level, "message": message}, separators=(',', ':')) + "\n"
+        return f"{datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')} {_clock(timestamp, self._clock)} " \
+               f"{level.upper():<7} {message}\n"
+
+    def write(self, records: List[LogRecord]) -> None:
+        text = "".join(self._format(record) for record in records)
+        self._handle.write(text)
+        self._handle.flush()
+        self._size += len(text)
+        if self.max_bytes and self._size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._handle.close()
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        self._handle = open(self.path, 'w' if not self.backups else 'a', buffering=64 * 1024, encoding='utf-8')
+        self._size = 0
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class LogPipeline:
+    def __init__(self, level: str = "info", batch_size: int = 256):
+        self.queue: queue.Queue = queue.Queue()
+        self.batch_size = batch_size
+        self.console: Optional[ConsoleLogSink] = ConsoleLogSink()
+        self.sinks: List[Any] = []
+        self.level = level
+
+    @property
+    def level(self) -> str:
+        return self._level
+
+    @level.setter
+    def level(self, level: str) -> None:
+        if level not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level '{level}' (choose from {', '.join(LOG_LEVELS)})")
+        self._level = level
+        self.threshold = LOG_LEVELS[level]
+
+    def enabled_for(self, level: str) -> bool:
+        return LOG_LEVELS.get(level, 20) >= self.threshold
+
+    def add_file(self, path: str, fmt: str = "text", max_bytes: int = 10 * 1024 * 1024, backups: int = 3) -> None:
+        self.sinks.append(FileLogSink(path, fmt, max_bytes, backups))
+
+    def run(self) -> None:
+        while True:
+            first = self.queue.get()
+            batch = [first]
+            while first is not None and len(batch) < self.batch_size:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(record)
+                if record is None:
+                    break
+
+            stop = batch[-1] is None
+            records = batch[:-1] if stop else batch
+            try:
+                if records:
+                    for sink in ([self.console] if self.console else []) + self.sinks:
+                        sink.write(records)
+            except Exception as e:
+                print(f"Logger error: {str(e)}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+            if stop:
+                return
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+
+
+class Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Any] = {
             "requests": 0,
             "usernames_checked": 0,
             "start_time": None,
             "rate_limited_count": 0
         }
-        self.log_queue = queue.Queue()
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._values[key] = value
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            value = self._values.get(key, 0) + amount
+            self._values[key] = value
+            return value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._values)
+
+
+class RequestContext:
+    __slots__ = ('session', 'pool', 'proxy', 'user_agent', 'requests')
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        self.session = session
+        self.pool: Optional[ProxyPool] = None
+        self.proxy: Optional[ProxyState] = None
+        self.user_agent = DEFAULT_HEADERS['User-Agent']
+        self.requests = 0
+
+
+class HermesMonitor:
+    def __init__(self, save_file: str = "hermes_found_usernames.json", lazy_load: bool = False):
+        self._local = threading.local()
+        self.user_agents = self._load_user_agents()
+        self.proxies: List[Proxy] = []
+        self.proxy_pool: Optional[ProxyPool] = None
+        self._target_matcher = None
+        self._target_checks: List[Tuple[str, Any]] = []
+        self.target_specs: List[TargetSpec] = []
+        self.target_length = 4  
+        self._stop_event = threading.Event()
+        self._running = False
+        self.api_base = "https://www.tiktok.com/api"
+        self.save_file = save_file
+        self.lazy_load = lazy_load
+        self.store: ResultStore = open_result_store(self.save_file, lazy=self.lazy_load)
+        self.stats = Stats()
+        self.metrics = Metrics()
+        self.metrics_target: Optional[str] = None
+        self.profiler = CycleProfiler()
+        self._workers_lock = threading.Lock()
+        self._active_workers = 0
+        self.decoder = JsonDecoder()
+        self.concurrency = 1
+        self.rate_controller = RateController()
+        self.requests_per_second = 0.5
+        self.response_cache = ResponseCache()
+        self.scheduler: Optional[YieldScheduler] = None
+        self.max_rate_limit_retries = 2
+        self.retry_policy = RetryPolicy()
+        self.circuit_breaker = CircuitBreaker()
+        self.max_pages = 3
+        self._prefetcher: Optional[ThreadPoolExecutor] = None
+        self.logger = LogPipeline()
+        self.log_queue = self.logger.queue
 
         self._load_saved_results()
 
-    def _create_session(self) -> requests.Session:
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://www.tiktok.com/',
-            'Origin': 'https://www.tiktok.com'
-        })
-        return session
+    @property
+    def session(self) -> requests.Session:
+        context = self._context()
+        if context.proxy is not None:
+            return context.proxy.session
+        if context.session is None:
+            context.session = create_session()
+        return context.session
+
+    def _context(self) -> RequestContext:
+        context = getattr(self._local, 'context', None)
+        if context is None:
+            context = RequestContext()
+            self._local.context = context
+        if context.pool is not self.proxy_pool:
+            context.pool = self.proxy_pool
+            context.proxy = context.pool.select() if context.pool is not None else None
+        return context
 
     def _load_user_agents(self) -> List[str]:
         return [
@@ -124,18 +2596,16 @@ class HermesMonitor:
         ]
 
     def _rotate_user_agent(self) -> None:
-        self.session.headers.update({
-            'User-Agent': random.choice(self.user_agents)
-        })
+        self._context().user_agent = random.choice(self.user_agents)
 
     def _rotate_proxy(self) -> None:
-        if not self.proxies:
+        if self.proxy_pool is None:
             return
 
-        self.current_proxy_index = (self.current_proxy_index + 1) % len(self.proxies)
-        proxy = self.proxies[self.current_proxy_index]
-        self.session.proxies.update(proxy.proxy_dict)
-        self.log(f"Rotated to proxy: {proxy}", level="debug")
+        context = self._context()
+        context.proxy = self.proxy_pool.select(context.proxy)
+        if self.logger.enabled_for("debug"):
+            self.log(f"Rotated to proxy: {context.proxy.proxy}", level="debug")
 
     def load_proxies_from_file(self, filename: str) -> None:
         try:
@@ -153,277 +2623,456 @@ class HermesMonitor:
                 elif len(parts) == 4:
                     self.proxies.append(Proxy(parts[0], int(parts[1]), parts[2], parts[3]))
 
+            if self.proxy_pool is not None:
+                self.proxy_pool.close()
+            self.proxy_pool = ProxyPool(self.proxies, pool_size=max(10, self.concurrency)) if self.proxies else None
             if self.proxies:
                 self.log(f"Loaded {len(self.proxies)} proxies", level="info")
-
-                self._rotate_proxy()
         except Exception as e:
             self.log(f"Failed to load proxies: {str(e)}", level="error")
 
+    def set_metrics_target(self, target: Optional[str], flush_interval: float = 15.0) -> None:
+        try:
+            if not target:
+                self.metrics.stop()
+            elif target.isdigit():
+                self.metrics.serve(int(target))
+                self.log(f"Serving metrics on http://127.0.0.1:{target}/metrics", level="info")
+            else:
+                self.metrics.flush_every(target, flush_interval)
+                self.log(f"Writing metrics to {target} every {flush_interval:.0f}s", level="info")
+            self.metrics_target = target
+        except Exception as e:
+            self.log(f"Failed to start metrics: {str(e)}", level="error")
+
     def _load_saved_results(self) -> None:
         try:
-            if os.path.exists(self.save_file):
-                with open(self.save_file, 'r') as f:
-                    data = json.load(f)
-
-                self.found_usernames = set(data.get('usernames', []))
-                users_data = data.get('users', [])
-
-                for user_data in users_data:
-                    discovery_time = datetime.fromisoformat(user_data.get('discovery_time', 
-                                                                     datetime.now().isoformat()))
-                    user = UserAccount(
-                        username=user_data.get('username', ''),
-                        nickname=user_data.get('nickname', ''),
-                        followers=user_data.get('followers', 0),
-                        profile_url=user_data.get('profile_url', ''),
-                        video_url=user_data.get('video_url', ''),
-                        verified=user_data.get('verified', False),
-                        discovery_time=discovery_time
-                    )
-                    self.found_users.append(user)
-
-                self.log(f"Loaded {len(self.found_usernames)} previously found usernames", level="info")
+            loaded = self.store.load()
+            if loaded:
+                self.log(f"Loaded {loaded} previously found usernames", level="info")
         except Exception as e:
             self.log(f"Failed to load saved results: {str(e)}", level="error")
 
     def _save_results(self) -> None:
         try:
-            users_data = []
-            for user in self.found_users:
-                users_data.append({
-                    'username': user.username,
-                    'nickname': user.nickname,
-                    'followers': user.followers,
-                    'profile_url': user.profile_url,
-                    'video_url': user.video_url,
-                    'verified': user.verified,
-                    'discovery_time': user.discovery_time.isoformat()
-                })
-
-            data = {
-                'usernames': list(self.found_usernames),
-                'users': users_data,
-                'last_updated': datetime.now().isoformat()
-            }
-
-            with open(self.save_file, 'w') as f:
-                json.dump(data, f, indent=2)
-
-            self.log(f"Saved {len(self.found_usernames)} usernames to {self.save_file}", level="debug")
+            with self.profiler.span("persist"):
+                saved = self.store.flush()
+            if saved:
+                self.log(f"Saved {saved} new usernames to {self.save_file}", level="debug")
         except Exception as e:
             self.log(f"Failed to save results: {str(e)}", level="error")
 
+    def _set_save_file(self, save_file: str) -> None:
+        try:
+            store = open_result_store(save_file, lazy=self.lazy_load)
+            store.load()
+            for user in self.store.iter_by_followers():
+                store.add(user)
+            store.flush()
+        except Exception as e:
+            self.log(f"Failed to open save file: {str(e)}", level="error")
+            return
+
+        self.store.close()
+        self.store = store
+        self.save_file = save_file
+
+    def _set_lazy_load(self, lazy_load: bool) -> None:
+        self.store.close()
+        self.lazy_load = lazy_load
+        self.store = open_result_store(self.save_file, lazy=self.lazy_load)
+        self._load_saved_results()
+
     def log(self, message: str, level: str = "info") -> None:
-        time_str = datetime.now().strftime("%H:%M:%S")
-
-        color_map = {
-            "error": Fore.RED,
-            "warning": Fore.YELLOW,
-            "info": Fore.WHITE,
-            "success": Fore.GREEN,
-            "debug": Fore.CYAN
-        }
+        if LOG_LEVELS.get(level, 20) >= self.logger.threshold:
+            self.log_queue.put((time.time(), level, message))
+
+    @property
+    def running(self) -> bool:
+        return self._running
 
-        color = color_map.get(level, Fore.WHITE)
-        formatted = f"[{time_str}] {color}{message}{Style.RESET_ALL}"
-        self.log_queue.put(formatted)
+    @running.setter
+    def running(self, running: bool) -> None:
+        self._running = running
+        self._stop_event.clear()
+
+    def stop(self) -> None:
+        self._running = False
+        self._stop_event.set()
+
+    def _wait(self, seconds: float) -> bool:
+        if seconds <= 0:
+            return not self._stop_event.is_set()
+        return not self._stop_event.wait(seconds)
+
+    @property
+    def requests_per_second(self) -> float:
+        return self._requests_per_second
+
+    @requests_per_second.setter
+    def requests_per_second(self, requests_per_second: float) -> None:
+        self._requests_per_second = requests_per_second
+        self.rate_controller.set_budget(requests_per_second)
+
+    @property
+    def target_length(self) -> int:
+        return self._target_length
+
+    @target_length.setter
+    def target_length(self, length: int) -> None:
+        self.set_target_specs([TargetSpec(length)])
+
+    @property
+    def target_label(self) -> str:
+        return ", ".join(spec.name for spec in self.target_specs)
+
+    def set_target_specs(self, specs: List[TargetSpec]) -> None:
+        alnum = {spec.length for spec in specs if spec.pattern == "alnum"}
+        gates = dict.fromkeys(TargetSpec(spec.length).gate if spec.length in alnum else spec.gate for spec in specs)
+        self._target_matcher = re.compile(r'@?(%s)' % "|".join(gates))
+        self._target_checks = [(spec.name, re.compile(spec.regex).fullmatch) for spec in specs]
+        self._target_length = specs[0].length
+        self.target_specs = list(specs)
+
+    def classify_username(self, username: str) -> Tuple[str, ...]:
+        return tuple(name for name, check in self._target_checks if check(username))
 
     def is_target_username(self, username: str) -> bool:
-        if username.startswith('@'):
-            username = username[1:]
+        matched = self._target_matcher.fullmatch(username)
+        return matched is not None and bool(self.classify_username(matched.group(1)))
 
-        return len(username) == self.target_length and username.isalnum()
+    def _prepare_request(self) -> None:
+        self.stats.incr("requests")
+        context = self._context()
+        context.requests += 1
 
-    def make_request(self, url: str, params: Dict = None) -> Dict:
-        self.stats["requests"] += 1
+        if context.requests % 10 == 0:
+            self._rotate_user_agent()
 
-        try:
+        if self.proxy_pool is not None and context.requests % 5 == 0:
+            self._rotate_proxy()
 
-            if self.stats["requests"] % 10 == 0:
-                self._rotate_user_agent()
+    def _observe_proxy(self, proxy: Optional[ProxyState], latency: Optional[float], ok: bool) -> None:
+        if proxy is None or self.proxy_pool is None:
+            return
+        if self.proxy_pool.observe(proxy, latency, ok):
+            self.log(f"Proxy {proxy.proxy} failed {proxy.failures} times in a row, dropping it for "
+                     f"{proxy.down_until - time.monotonic():.0f}s", level="warning")
+            self._rotate_proxy()
+
+    def _handle_response(self, endpoint: str, status_code: int, content: bytes,
+                         headers: Dict[str, str]) -> Optional[Dict]:
+        if status_code == 429:
+            self.stats.incr("rate_limited_count")
+            wait = self.rate_controller.on_rate_limited(endpoint, parse_retry_after(headers.get('Retry-After')))
+            self.log(f"Rate limited on {endpoint}. Backing off {wait:.1f}s and rotating proxy and user agent.",
+                     level="warning")
+            self._rotate_user_agent()
+            self._rotate_proxy()
+            return None
+
+        if status_code == 200:
+            self.rate_controller.on_success(endpoint)
+            start = time.perf_counter()
+            with self.profiler.span("decode"):
+                data = self.decoder.decode(content)
+            self.metrics.observe_decode(endpoint, time.perf_counter() - start)
+            return data
+        else:
+            self.log(f"Error: Status code {status_code}", level="error")
+            return {}
 
-            if self.proxies and self.stats["requests"] % 5 == 0:
-                self._rotate_proxy()
+    def _admit(self, endpoint: str) -> bool:
+        if self.circuit_breaker.allow(endpoint):
+            if self.circuit_breaker.state(endpoint) == CIRCUIT_HALF_OPEN:
+                self.metrics.set_circuit(endpoint, CIRCUIT_HALF_OPEN)
+                self.log(f"Probing {endpoint} after its circuit cooled down", level="info")
+            return True
+        self.stats.incr("circuit_rejected")
+        if self.logger.enabled_for("debug"):
+            self.log(f"Skipping {endpoint}: circuit open for another "
+                     f"{self.circuit_breaker.retry_after(endpoint):.0f}s", level="debug")
+        return False
+
+    def _record_success(self, endpoint: str) -> None:
+        if self.circuit_breaker.on_success(endpoint):
+            self.metrics.set_circuit(endpoint, CIRCUIT_CLOSED)
+            self.log(f"Circuit for {endpoint} closed again", level="success")
+
+    def _record_failure(self, endpoint: str, error: str, failures: int) -> Optional[float]:
+        if self.circuit_breaker.on_failure(endpoint):
+            self.metrics.set_circuit(endpoint, CIRCUIT_OPEN)
+            self.log(f"{error} on {endpoint}. Circuit opened, pausing {endpoint} for "
+                     f"{self.circuit_breaker.reset_timeout:.0f}s", level="error")
+            return None
+        if failures >= self.retry_policy.attempts:
+            self.log(f"{error} on {endpoint}, giving up after {failures} attempts", level="error")
+            return None
+
+        delay = self.retry_policy.delay(failures)
+        self.stats.incr("retries")
+        self.metrics.observe_retry(endpoint)
+        self.log(f"{error} on {endpoint}, retrying in {delay:.1f}s "
+                 f"(attempt {failures + 1}/{self.retry_policy.attempts})", level="warning")
+        return delay
 
-            response = self.session.get(url, params=params, timeout=10)
+    def make_request(self, url: str, params: Dict = None) -> Dict:
+        import requests
+        endpoint = endpoint_name(url)
+        proxy = None
+        rate_limited = failures = 0
 
-            if response.status_code == 429:
-                self.stats["rate_limited_count"] += 1
-                self.log("Rate limited by TikTok. Rotating proxy and user agent.", level="warning")
-                self._rotate_user_agent()
-                if self.proxies:
-                    self._rotate_proxy()
-                time.sleep(random.uniform(5, 10))
+        while self._admit(endpoint):
+            try:
+                delay = self.rate_controller.reserve(endpoint)
+                if not self._wait(delay):
+                    self.circuit_breaker.release(endpoint)
+                    return {}
+
+                self._prepare_request()
+                context = self._context()
+                proxy = context.proxy
+
+                start = time.perf_counter()
+                with self.profiler.span("fetch"):
+                    response = self.session.get(url, params=params, headers={'User-Agent': context.user_agent},
+                                                timeout=10)
+                latency = time.perf_counter() - start
+                self.metrics.observe_request(endpoint, latency, response.status_code, len(response.content))
+                self._observe_proxy(proxy, latency, response.status_code < 500 and response.status_code != 429)
+
+                if response.status_code >= 500:
+                    error = f"Status code {response.status_code}"
+                else:
+                    data = self._handle_response(endpoint, response.status_code, response.content, response.headers)
+                    self._record_success(endpoint)
+                    if data is not None:
+                        return data
+                    rate_limited += 1
+                    if rate_limited > self.max_rate_limit_retries:
+                        return {}
+                    continue
+
+            except requests.exceptions.RequestException as e:
+                error = f"Request error: {str(e)}"
+                self._observe_proxy(proxy, None, False)
+                self._rotate_proxy()
+            except json.JSONDecodeError:
+                error = "Invalid JSON response"
+            except Exception as e:
+                self.log(f"Unexpected error: {str(e)}", level="error")
+                self.circuit_breaker.release(endpoint)
                 return {}
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                self.log(f"Error: Status code {response.status_code}", level="error")
+            failures += 1
+            delay = self._record_failure(endpoint, error, failures)
+            if delay is None or not self._wait(delay):
                 return {}
 
-        except requests.exceptions.RequestException as e:
-            self.log(f"Request error: {str(e)}", level="error")
-            if self.proxies:
-                self._rotate_proxy()
-            return {}
-        except json.JSONDecodeError:
-            self.log("Error: Invalid JSON response", level="error")
-            return {}
-        except Exception as e:
-            self.log(f"Unexpected error: {str(e)}", level="error")
-            return {}
+        return {}
 
-    def get_trending_posts(self) -> List[Dict]:
-        url = "https://www.tiktok.com/api/recommend/item_list/"
+    def _trending_request(self) -> Tuple[str, Dict]:
+        url = f"{self.api_base}/recommend/item_list/"
         params = {
             "aid": "1988",
             "app_language": "en",
             "count": 30,
             "from_page": "fyp"
         }
+        return url, params
 
-        data = self.make_request(url, params)
-        return data.get('itemList', [])
-
-    def search_by_keyword(self, keyword: str) -> List[Dict]:
-        url = "https://www.tiktok.com/api/search/user/full/"
+    def _search_request(self, keyword: str, cursor: Any = None) -> Tuple[str, Dict]:
+        url = f"{self.api_base}/search/user/full/"
         params = {
             "aid": "1988",
             "app_language": "en",
             "keyword": keyword,
             "count": 30
         }
+        if cursor is not None:
+            params["cursor"] = cursor
+        return url, params
 
-        data = self.make_request(url, params)
-        return data.get('userList', [])
-
-    def search_by_suggested(self) -> List[Dict]:
-        url = "https://www.tiktok.com/api/recommend/user/list/"
+    def _suggested_request(self, cursor: Any = None) -> Tuple[str, Dict]:
+        url = f"{self.api_base}/recommend/user/list/"
         params = {
             "aid": "1988",
             "app_language": "en",
             "count": 30
         }
+        if cursor is not None:
+            params["cursor"] = cursor
+        return url, params
 
-        data = self.make_request(url, params)
-        return data.get('userList', [])
-
-    def check_trending_posts(self) -> List[UserAccount]:
-        found_users = []
-        posts = self.get_trending_posts()
-
-        for post in posts:
-            try:
-                author = post.get('author', {})
-                username = author.get('uniqueId', '')
-                self.stats["usernames_checked"] += 1
-
-                if self.is_target_username(username) and username not in self.found_usernames:
-                    self.found_usernames.add(username)
-
-                    user = UserAccount(
-                        username=username,
-                        nickname=author.get('nickname', ''),
-                        followers=post.get('authorStats', {}).get('followerCount', 0),
-                        video_url=f"https://www.tiktok.com/@{username}/video/{post.get('id', '')}",
-                        verified=author.get('verified', False)
-                    )
-
-                    found_users.append(user)
-                    self.found_users.append(user)
-                    self.log(f"Found target username: @{username}", level="success")
-            except Exception as e:
-                self.log(f"Error processing post: {str(e)}", level="error")
+    def get_trending_posts(self) -> List[Dict]:
+        data = self.make_request(*self._trending_request())
+        return data.get(TRENDING_SPEC.list_key, [])
 
-        return found_users
+    def search_by_keyword(self, keyword: str) -> List[Dict]:
+        data = self.make_request(*self._search_request(keyword))
+        return data.get(SEARCH_SPEC.list_key, [])
 
-    def check_search_results(self, keyword: str) -> List[UserAccount]:
-        found_users = []
-        users = self.search_by_keyword(keyword)
+    def search_by_suggested(self) -> List[Dict]:
+        data = self.make_request(*self._suggested_request())
+        return data.get(SUGGESTED_SPEC.list_key, [])
+
+    def _prefetch(self, request: Tuple[str, Dict]) -> Future:
+        with self._workers_lock:
+            if self._prefetcher is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._prefetcher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hermes-prefetch")
+        return self._prefetcher.submit(self.make_request, *request)
+
+    def iter_pages(self, build_request: Callable[[Any], Tuple[str, Dict]], spec: ExtractSpec,
+                   data: Optional[Dict] = None) -> Iterator[List[Dict]]:
+        if data is None:
+            data = self.make_request(*build_request(None))
+        user_path = () if self.decoder.selective else spec.user_path
+        seen = set()
+        pending: Optional[Future] = None
 
-        for user_entry in users:
-            try:
-                user_info = user_entry.get('user', {})
-                username = user_info.get('uniqueId', '')
-                self.stats["usernames_checked"] += 1
-
-                if self.is_target_username(username) and username not in self.found_usernames:
-                    self.found_usernames.add(username)
-
-                    user = UserAccount(
-                        username=username,
-                        nickname=user_info.get('nickname', ''),
-                        followers=user_info.get('followerCount', 0),
-                        verified=user_info.get('verified', False)
-                    )
-
-                    found_users.append(user)
-                    self.found_users.append(user)
-                    self.log(f"Found target username: @{username}", level="success")
-            except Exception as e:
-                self.log(f"Error processing user: {str(e)}", level="error")
+        try:
+            for page in range(max(1, self.max_pages)):
+                items = data.get(spec.list_key, [])
+                authors = {_walk(item, user_path).get('uniqueId') for item in items} - seen
+                authors.discard(None)
+                if not authors:
+                    if page:
+                        self.log(f"Stopping {spec.source} pagination after {page} pages: no new authors",
+                                 level="debug")
+                    return
+                seen |= authors
+
+                cursor = data.get('cursor')
+                if page + 1 < self.max_pages and data.get('hasMore', data.get('has_more')) and cursor not in (None, ""):
+                    pending = self._prefetch(build_request(cursor))
+
+                yield items
+
+                if pending is None:
+                    return
+                data, pending = pending.result(), None
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def extract_targets(self, items: List[Dict], spec: ExtractSpec) -> List[UserAccount]:
+        if self.decoder.selective:
+            spec = spec.flattened()
+
+        with self.profiler.span("extract"):
+            match = self._target_matcher.fullmatch
+            classify = self.classify_username
+            candidates: Dict[str, Tuple[Dict, Tuple[str, ...]]] = {}
+            authors = []
+
+            for item in items:
+                username = _walk(item, spec.user_path).get('uniqueId')
+                if not isinstance(username, str):
+                    continue
+                authors.append(username)
+                matched = match(username)
+                if matched and matched.group(1) not in candidates:
+                    tags = classify(matched.group(1))
+                    if tags:
+                        candidates[matched.group(1)] = (item, tags)
+
+        self.stats.incr("usernames_checked", len(items))
+        if self.scheduler is not None:
+            self.scheduler.observe_authors(authors)
+        if not candidates:
+            self.metrics.observe_page(spec.endpoint, len(items), 0)
+            return []
+
+        with self.profiler.span("dedup"):
+            new_usernames = self.store.filter_new(candidates)
+            new_users = []
+            for username, (item, tags) in candidates.items():
+                if username not in new_usernames:
+                    continue
 
+                author = _walk(item, spec.user_path)
+                new_users.append(UserAccount(
+                    username=username,
+                    nickname=str(author.get('nickname') or ''),
+                    followers=_as_int(_walk(item, spec.stats_path).get('followerCount')),
+                    video_id=str(item.get('id', '')) if spec.with_video else "",
+                    verified=bool(author.get('verified')),
+                    tags=tags
+                ))
+            found_users = self.store.add_many(new_users)
+
+        self.metrics.observe_page(spec.endpoint, len(items), len(found_users))
         return found_users
 
-    def check_suggested_users(self) -> List[UserAccount]:
-
-        found_users = []
-        users = self.search_by_suggested()
-
-        for user_entry in users:
-            try:
-                username = user_entry.get('uniqueId', '')
-                self.stats["usernames_checked"] += 1
-
-                if self.is_target_username(username) and username not in self.found_usernames:
-                    self.found_usernames.add(username)
-
-                    user = UserAccount(
-                        username=username,
-                        nickname=user_entry.get('nickname', ''),
-                        followers=user_entry.get('followerCount', 0),
-                        verified=user_entry.get('verified', False)
-                    )
-
-                    found_users.append(user)
-                    self.found_users.append(user)
-                    self.log(f"Found target username: @{username}", level="success")
-            except Exception as e:
-                self.log(f"Error processing suggested user: {str(e)}", level="error")
+    def check_trending_posts(self) -> List[UserAccount]:
+        return self.extract_targets(self.get_trending_posts(), TRENDING_SPEC)
 
-        return found_users
+    def check_search_results(self, keyword: str) -> List[UserAccount]:
+        for _, request in self._due_searches([keyword]):
+            return self._extract_search_pages(keyword, request, self.make_request(*request))
+        return []
+
+    def _due_searches(self, keywords: List[str]) -> List[Tuple[str, Tuple[str, Dict]]]:
+        due = []
+        for keyword in keywords:
+            request = self._search_request(keyword)
+            key = self.response_cache.key(*request)
+            if self.response_cache.due(key):
+                due.append((keyword, request))
+            elif self.logger.enabled_for("debug"):
+                self.log(f"Skipping '{keyword}': results unchanged, next refresh in "
+                         f"{self.response_cache.next_refresh(key):.0f}s", level="debug")
+        return due
+
+    def _extract_search_pages(self, keyword: str, request: Tuple[str, Dict], data: Dict) -> List[UserAccount]:
+        items = data.get(SEARCH_SPEC.list_key, [])
+        if not items:
+            return []
+
+        spec = SEARCH_SPEC.flattened() if self.decoder.selective else SEARCH_SPEC
+        if not self.response_cache.update(self.response_cache.key(*request), self.response_cache.digest(items, spec)):
+            return []
+
+        found = []
+        for page in self.iter_pages(lambda cursor: self._search_request(keyword, cursor), SEARCH_SPEC, data):
+            found.extend(self.extract_targets(page, SEARCH_SPEC))
+        return found
 
-    def monitor_trending(self, interval: int = 60) -> None:
+    def check_suggested_users(self) -> List[UserAccount]:
+        found = []
+        for page in self.iter_pages(self._suggested_request, SUGGESTED_SPEC):
+            found.extend(self.extract_targets(page, SUGGESTED_SPEC))
+        return found
+
+    def _log_stats(self) -> None:
+        elapsed = (datetime.now() - self.stats["start_time"]).total_seconds()
+        req_per_min = (self.stats["requests"] / elapsed) * 60 if elapsed > 0 else 0
+        retries = self.stats.snapshot().get("retries", 0)
+        self.log(f"Stats: {self.stats['usernames_checked']} usernames checked, "
+              f"{len(self.store)} found, "
+              f"{req_per_min:.1f} req/min, "
+              f"{self.decoder.average_ms:.2f} ms/decode ({self.decoder.backend}), "
+              f"{self.response_cache.skipped} cached skips, "
+              f"{self.response_cache.unchanged} unchanged pages"
+              + (f", {self.proxy_pool.healthy}/{len(self.proxy_pool)} proxies healthy" if self.proxy_pool else "")
+              + (f", {retries} retries" if retries else "")
+              + "".join(f", {endpoint} circuit {state}" for endpoint, state in self.circuit_breaker.states().items()
+                        if state != CIRCUIT_CLOSED),
+              level="info")
+
+    def _next_wait(self, endpoint: str, interval: Optional[int]) -> float:
+        wait = max(self.rate_controller.delay(endpoint), self.circuit_breaker.retry_after(endpoint))
+        if interval:
+            wait = max(wait, random.uniform(interval * 0.8, interval * 1.2))
+        return wait
+
+    def _run_monitor(self, loop: Any, *args: Any) -> None:
         self.running = True
         self.stats["start_time"] = datetime.now()
 
         try:
-            while self.running:
-                self.log(f"Checking trending posts for {self.target_length}-letter usernames...")
-
-                found = self.check_trending_posts()
-
-                if found:
-                    self.log(f"Found {len(found)} new target usernames!", level="success")
-                    for user in found:
-                        print(user.format_details())
-                    self._save_results()
-
-                elapsed = (datetime.now() - self.stats["start_time"]).total_seconds()
-                req_per_min = (self.stats["requests"] / elapsed) * 60 if elapsed > 0 else 0
-                self.log(f"Stats: {self.stats['usernames_checked']} usernames checked, "
-                      f"{len(self.found_usernames)} found, "
-                      f"{req_per_min:.1f} req/min", level="info")
-
-                sleep_time = random.uniform(interval * 0.8, interval * 1.2)
-                self.log(f"Waiting {sleep_time:.1f} seconds before next check...")
-
-                start_time = time.time()
-                while time.time() - start_time < sleep_time and self.running:
-                    time.sleep(1)
-
+            loop(*args)
         except KeyboardInterrupt:
             self.log("Monitoring stopped by user", level="warning")
         except Exception as e:
@@ -432,50 +3081,203 @@ class HermesMonitor:
             self._save_results()
             self.running = False
 
-    def monitor_with_keywords(self, keywords: List[str], interval: int = 60) -> None:
-        self.running = True
-        self.stats["start_time"] = datetime.now()
+    def monitor_trending(self, interval: Optional[int] = None) -> None:
+        self._run_monitor(self._trending_loop, interval)
 
-        try:
-            while self.running:
-                for keyword in keywords:
+    def monitor_with_keywords(self, keywords: List[str], interval: Optional[int] = None) -> None:
+        self._run_monitor(self._keyword_loop, keywords, interval)
+
+    def monitor_suggested(self, interval: Optional[int] = None) -> None:
+        self._run_monitor(self._suggested_loop, interval)
+
+    def monitor_sources(self, sources: List[str], keywords: List[str], interval: Optional[int] = None) -> None:
+        self._run_monitor(self._sources_loop, sources, keywords, interval)
+
+    def monitor_scheduled(self, sources: List[str], keywords: List[str], interval: Optional[int] = None) -> None:
+        self._run_monitor(self._scheduled_loop, sources, keywords, interval)
+
+    def _trending_loop(self, interval: Optional[int]) -> None:
+        endpoint = endpoint_name(self._trending_request()[0])
+
+        while self.running:
+            with self.profiler.cycle("trending"):
+                self.log(f"Checking trending posts for target usernames ({self.target_label})...")
+
+                self._report_found(self.check_trending_posts())
+
+                self._log_stats()
+
+            sleep_time = self._next_wait(endpoint, interval)
+            self.log(f"Waiting {sleep_time:.1f} seconds before next check "
+                     f"({self.rate_controller.rate(endpoint) * 60:.1f} req/min allowed)...")
+
+            self._wait(sleep_time)
+
+    def _keyword_loop(self, keywords: List[str], interval: Optional[int]) -> None:
+        endpoint = endpoint_name(self._search_request("")[0])
+        engine = AsyncFetchEngine(self, self.concurrency, self.requests_per_second)
+
+        while self.running:
+            if engine.concurrency > 1:
+                with self.profiler.cycle("keywords"):
+                    self._search_keywords_concurrently(engine, keywords)
+            else:
+                for keyword, request in self._due_searches(keywords):
                     if not self.running:
                         break
 
-                    self.log(f"Searching for '{keyword}'...")
-                    found = self.check_search_results(keyword)
+                    with self.profiler.cycle("keywords"):
+                        self.log(f"Searching for '{keyword}'...")
+                        found = self._extract_search_pages(keyword, request, self.make_request(*request))
+                        self._report_found(found, f" for '{keyword}'")
 
-                    if found:
-                        self.log(f"Found {len(found)} new target usernames for '{keyword}'!", level="success")
-                        for user in found:
-                            print(user.format_details())
-                        self._save_results()
+            self._log_stats()
 
-                    time.sleep(random.uniform(5, 10))
+            refresh = min((self._keyword_refresh(keyword) for keyword in keywords), default=0.0)
+            sleep_time = max(self._next_wait(endpoint, interval), refresh)
+            self.log(f"Waiting {sleep_time:.1f} seconds before next round "
+                     f"({self.rate_controller.rate(endpoint) * 60:.1f} req/min allowed)...")
 
-                elapsed = (datetime.now() - self.stats["start_time"]).total_seconds()
-                req_per_min = (self.stats["requests"] / elapsed) * 60 if elapsed > 0 else 0
-                self.log(f"Stats: {self.stats['usernames_checked']} usernames checked, "
-                      f"{len(self.found_usernames)} found, "
-                      f"{req_per_min:.1f} req/min", level="info")
+            self._wait(sleep_time)
 
-                sleep_time = random.uniform(interval * 0.8, interval * 1.2)
-                self.log(f"Waiting {sleep_time:.1f} seconds before next round...")
+    def _suggested_loop(self, interval: Optional[int]) -> None:
+        endpoint = endpoint_name(self._suggested_request()[0])
 
-                start_time = time.time()
-                while time.time() - start_time < sleep_time and self.running:
-                    time.sleep(1)
+        while self.running:
+            with self.profiler.cycle("suggested"):
+                self.log("Checking suggested users...")
 
-        except KeyboardInterrupt:
-            self.log("Monitoring stopped by user", level="warning")
+                self._report_found(self.check_suggested_users(), " in suggested users")
+
+            self._wait(self._next_wait(endpoint, interval))
+
+    def _sources_loop(self, sources: List[str], keywords: List[str], interval: Optional[int]) -> None:
+        loops = {
+            "trending": (self._trending_loop, (interval,)),
+            "keywords": (self._keyword_loop, (keywords, interval)),
+            "suggested": (self._suggested_loop, (interval,))
+        }
+
+        workers = []
+        for source in sources:
+            if source == "keywords" and not keywords:
+                continue
+            loop, args = loops[source]
+            workers.append(threading.Thread(target=self._run_worker, args=(source, loop, args),
+                                            name=f"hermes-{source}", daemon=True))
+
+        self._active_workers = len(workers)
+        self.log(f"Running {len(workers)} sources concurrently: {', '.join(w.name[7:] for w in workers)}")
+        for worker in workers:
+            worker.start()
+
+        try:
+            if workers:
+                self._stop_event.wait()
+        finally:
+            self.stop()
+            for worker in workers:
+                worker.join()
+
+    def _scheduled_loop(self, sources: List[str], keywords: List[str], interval: Optional[int]) -> None:
+        checks: Dict[str, Callable[[], List[UserAccount]]] = {}
+        if "trending" in sources:
+            checks["trending"] = self.check_trending_posts
+        if "suggested" in sources:
+            checks["suggested"] = self.check_suggested_users
+        if "keywords" in sources:
+            for keyword in keywords:
+                checks[f"keyword:{keyword}"] = lambda keyword=keyword: self.check_search_results(keyword)
+        else:
+            keywords = []
+        if not checks:
+            self.log("Nothing to schedule: no sources, or the keywords source without keywords", level="error")
+            return
+
+        endpoints = {"trending": endpoint_name(self._trending_request()[0]),
+                     "suggested": endpoint_name(self._suggested_request()[0])}
+        search_endpoint = endpoint_name(self._search_request("")[0])
+
+        scheduler = self.scheduler = YieldScheduler()
+        for name in checks:
+            scheduler.add(name)
+        budget = TokenBucket(self.requests_per_second)
+        self.log(f"Scheduling {len(checks)} sources by yield: {', '.join(checks)}")
+
+        try:
+            while self.running:
+                waits = {name: self.circuit_breaker.retry_after(endpoints.get(name, search_endpoint)) for name in checks}
+                for keyword in keywords:
+                    name = f"keyword:{keyword}"
+                    waits[name] = max(waits[name], self._keyword_refresh(keyword))
+                name = scheduler.choose(arm for arm, wait in waits.items() if wait > 0)
+                if name is None:
+                    self._wait(min(waits.values()))
+                    continue
+
+                requests_before, authors_before = self.stats["requests"], scheduler.new_authors
+                with self.profiler.cycle(name.partition(':')[0]):
+                    found = checks[name]()
+                    self._report_found(found, f" from {name}")
+                requests_made = self.stats["requests"] - requests_before
+                scheduler.record(name, requests_made, scheduler.new_authors - authors_before, len(found))
+
+                if scheduler.pulls and scheduler.pulls % max(len(checks), 5) == 0:
+                    self._log_yield(scheduler)
+
+                delay = 0.0
+                for _ in range(requests_made):
+                    delay = budget.reserve()
+                if interval:
+                    delay = max(delay, random.uniform(interval * 0.8, interval * 1.2))
+                self._wait(delay)
+        finally:
+            self.scheduler = None
+
+    def _keyword_refresh(self, keyword: str) -> float:
+        if not self.response_cache.enabled:
+            return 0.0
+        return self.response_cache.next_refresh(self.response_cache.key(*self._search_request(keyword)))
+
+    def _log_yield(self, scheduler: YieldScheduler) -> None:
+        self._log_stats()
+        top = ", ".join(f"{arm.name} {arm.hits_per_request:.3f} hits/req {arm.authors_per_request:.1f} authors/req "
+                        f"({arm.total_requests} req)" for arm in scheduler.ranking()[:5])
+        self.log(f"Top sources by yield: {top}", level="info")
+
+    def _run_worker(self, source: str, loop: Any, args: Tuple) -> None:
+        try:
+            loop(*args)
         except Exception as e:
-            self.log(f"Error during monitoring: {str(e)}", level="error")
+            self.log(f"{source} worker stopped: {str(e)}", level="error")
         finally:
+            with self._workers_lock:
+                self._active_workers -= 1
+                last = self._active_workers == 0
+            if last:
+                self.stop()
+
+    def _search_keywords_concurrently(self, engine: AsyncFetchEngine, keywords: List[str]) -> None:
+        due = self._due_searches(keywords)
+        if not due:
+            return
+        self.log(f"Searching {len(due)} keywords with up to {engine.concurrency} requests in flight...")
+
+        with self.profiler.span("fetch"):
+            pages = engine.fetch_many([request for _, request in due])
+        for (keyword, request), data in zip(due, pages):
+            self._report_found(self._extract_search_pages(keyword, request, data), f" for '{keyword}'")
+
+    def _report_found(self, found: List[UserAccount], label: str = "") -> None:
+        if found:
+            with self.profiler.span("log"):
+                self.log(f"Found {len(found)} new target usernames{label}!", level="success")
+                for user in found:
+                    self.log(user.format_line(), level="success")
             self._save_results()
-            self.running = False
 
     def display_logo(self) -> None:
-        print(HERMES_LOGO)
+        print(hermes_logo())
 
     def display_menu(self) -> None:
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -488,77 +3290,121 @@ class HermesMonitor:
         print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}2.{Style.RESET_ALL} Search for usernames by keywords      {Fore.CYAN}║{Style.RESET_ALL}")
         print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}3.{Style.RESET_ALL} Check suggested users                 {Fore.CYAN}║{Style.RESET_ALL}")
         print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}4.{Style.RESET_ALL} View found usernames                  {Fore.CYAN}║{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}5.{Style.RESET_ALL} Change target username length         {Fore.CYAN}║{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}5.{Style.RESET_ALL} Change target usernames               {Fore.CYAN}║{Style.RESET_ALL}")
         print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}6.{Style.RESET_ALL} Load proxies                          {Fore.CYAN}║{Style.RESET_ALL}")
         print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}7.{Style.RESET_ALL} Settings                              {Fore.CYAN}║{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}8.{Style.RESET_ALL} Monitor all sources concurrently      {Fore.CYAN}║{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}9.{Style.RESET_ALL} Auto-schedule sources by yield        {Fore.CYAN}║{Style.RESET_ALL}")
         print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}0.{Style.RESET_ALL} Exit                                  {Fore.CYAN}║{Style.RESET_ALL}")
         print(f"{Fore.CYAN}╚══════════════════════════════════════════╝{Style.RESET_ALL}")
 
         print(f"\n{Fore.YELLOW}Current Status:{Style.RESET_ALL}")
-        print(f"  Target username length: {Fore.GREEN}{self.target_length}{Style.RESET_ALL} characters")
-        print(f"  Found usernames: {Fore.GREEN}{len(self.found_usernames)}{Style.RESET_ALL}")
-        print(f"  Active proxies: {Fore.GREEN}{len(self.proxies)}{Style.RESET_ALL}")
+        print(f"  Targets: {Fore.GREEN}{self.target_label}{Style.RESET_ALL}")
+        print(f"  Found usernames: {Fore.GREEN}{len(self.store)}{Style.RESET_ALL}")
+        healthy = self.proxy_pool.healthy if self.proxy_pool else 0
+        print(f"  Active proxies: {Fore.GREEN}{healthy}/{len(self.proxies)} healthy{Style.RESET_ALL}")
 
         print("\n" + Fore.CYAN + "=" * 50 + Style.RESET_ALL)
 
     def logger_thread(self) -> None:
-        while self.running or not self.log_queue.empty():
-            try:
+        self.logger.run()
 
-                if not self.log_queue.empty():
-                    message = self.log_queue.get(block=False)
-                    print(message)
-                    self.log_queue.task_done()
-                else:
-                    time.sleep(0.1)
-            except queue.Empty:
-                time.sleep(0.1)
-            except Exception as e:
-                print(f"Logger error: {str(e)}")
+    def _start_logger(self) -> threading.Thread:
+        logger_thread = threading.Thread(target=self.logger_thread)
+        logger_thread.daemon = True
+        logger_thread.start()
+        return logger_thread
 
-    def view_found_usernames(self) -> None:
-        os.system('cls' if os.name == 'nt' else 'clear')
-        self.display_logo()
+    def _stop_logger(self, logger_thread: threading.Thread) -> None:
+        self.log_queue.put(None)
+        logger_thread.join(timeout=2)
 
-        print(f"{Fore.CYAN}╔══════════════════════════════════════════╗{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}║{Style.RESET_ALL}          {Fore.YELLOW}FOUND USERNAMES{Style.RESET_ALL}               {Fore.CYAN}║{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}╚══════════════════════════════════════════╝{Style.RESET_ALL}")
+    def view_found_usernames(self, page_size: int = 10) -> None:
+        offset = 0
+        length: Optional[int] = None
+        verified = False
+        show_coverage = False
 
-        if not self.found_users:
-            print(f"\n{Fore.YELLOW}No usernames found yet.{Style.RESET_ALL}")
-        else:
-            print(f"\n{Fore.GREEN}Found {len(self.found_users)} usernames:{Style.RESET_ALL}\n")
+        while True:
+            os.system('cls' if os.name == 'nt' else 'clear')
+            self.display_logo()
 
-            sorted_users = sorted(self.found_users, key=lambda x: x.followers, reverse=True)
+            print(f"{Fore.CYAN}╔══════════════════════════════════════════╗{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}║{Style.RESET_ALL}          {Fore.YELLOW}FOUND USERNAMES{Style.RESET_ALL}               {Fore.CYAN}║{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}╚══════════════════════════════════════════╝{Style.RESET_ALL}")
+
+            if not len(self.store):
+                print(f"\n{Fore.YELLOW}No usernames found yet.{Style.RESET_ALL}")
+                input(f"\n{Fore.YELLOW}Press Enter to return to the main menu...{Style.RESET_ALL}")
+                return
 
-            for i, user in enumerate(sorted_users, 1):
+            if show_coverage:
+                print(f"\n{Fore.YELLOW}Coverage of the candidate space:{Style.RESET_ALL}")
+                for line in self.coverage_report():
+                    print(f"  {line}")
+                show_coverage = False
+
+            users, total = self.store.page_by_followers(offset, page_size, length, verified)
+            filters = ", ".join(filter(None, (f"{length} chars" if length else "", "verified" if verified else "")))
+            print(f"\n{Fore.GREEN}Found {total} usernames{f' ({filters})' if filters else ''}, "
+                  f"showing {min(offset + 1, total)}-{offset + len(users)}:{Style.RESET_ALL}\n")
+
+            for i, user in enumerate(users, offset + 1):
                 print(f"{Fore.CYAN}{i}.{Style.RESET_ALL}{user.format_details()}")
                 print(Fore.CYAN + "-" * 40 + Style.RESET_ALL)
 
-        input(f"\n{Fore.YELLOW}Press Enter to return to the main menu...{Style.RESET_ALL}")
+            command = input(f"\n{Fore.YELLOW}[n]ext [p]rev [j]ump <rank> [l]ength <3-5|all> [v]erified "
+                            f"[c]overage [Enter] back: {Fore.GREEN}").strip().lower()
+            print(Style.RESET_ALL, end="")
+            action, _, argument = command.partition(' ')
+
+            if not action:
+                return
+            elif action == "n" and offset + page_size < total:
+                offset += page_size
+            elif action == "p":
+                offset = max(0, offset - page_size)
+            elif action == "j" and argument.isdigit():
+                offset = min(max(0, int(argument) - 1), max(0, total - 1))
+            elif action == "l":
+                length = int(argument) if argument.isdigit() else None
+                offset = 0
+            elif action == "v":
+                verified = not verified
+                offset = 0
+            elif action == "c":
+                show_coverage = True
+
+    def coverage_report(self, prefix: str = "") -> List[str]:
+        lines = []
+        for length in range(max(3, len(prefix)), 6):
+            seen, total = self.store.coverage(prefix, length)
+            label = f"{length} chars" + (f" starting with '{prefix}'" if prefix else "")
+            lines.append(f"{label}: {seen:,} / {total:,} ({seen / total * 100 if total else 0:.4f}%)")
+        return lines
 
     def change_target_length(self) -> None:
         os.system('cls' if os.name == 'nt' else 'clear')
         self.display_logo()
 
         print(f"{Fore.CYAN}╔══════════════════════════════════════════╗{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}║{Style.RESET_ALL}       {Fore.YELLOW}CHANGE TARGET LENGTH{Style.RESET_ALL}             {Fore.CYAN}║{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}║{Style.RESET_ALL}       {Fore.YELLOW}CHANGE TARGETS{Style.RESET_ALL}                   {Fore.CYAN}║{Style.RESET_ALL}")
         print(f"{Fore.CYAN}╚══════════════════════════════════════════╝{Style.RESET_ALL}")
 
-        print(f"\nCurrent target length: {Fore.GREEN}{self.target_length}{Style.RESET_ALL} characters")
+        print(f"\nCurrent targets: {Fore.GREEN}{self.target_label}{Style.RESET_ALL}")
+        print(f"\nEnter one length (3-5) or comma-separated specs like {Fore.CYAN}3-5{Style.RESET_ALL}, "
+              f"{Fore.CYAN}4:letters{Style.RESET_ALL} or {Fore.CYAN}5:repeated{Style.RESET_ALL}.")
+        print(f"Patterns: {', '.join(TARGET_PATTERNS)}")
 
         try:
-            new_length = input(f"\nEnter new target length (3-5): {Fore.GREEN}")
+            new_targets = input(f"\nEnter new targets: {Fore.GREEN}")
             print(Style.RESET_ALL, end="")
 
-            new_length = int(new_length)
-            if 3 <= new_length <= 5:
-                self.target_length = new_length
-                print(f"\n{Fore.GREEN}Target length updated to {self.target_length} characters.{Style.RESET_ALL}")
-            else:
-                print(f"\n{Fore.RED}Invalid length. Please choose between 3 and 5.{Style.RESET_ALL}")
-        except ValueError:
-            print(f"\n{Fore.RED}Invalid input. Please enter a number.{Style.RESET_ALL}")
+            if new_targets.strip():
+                self.set_target_specs(TargetSpec.parse(new_targets))
+                print(f"\n{Fore.GREEN}Targets updated to {self.target_label}.{Style.RESET_ALL}")
+        except ValueError as e:
+            print(f"\n{Fore.RED}Invalid targets: {str(e)}{Style.RESET_ALL}")
 
         input(f"\n{Fore.YELLOW}Press Enter to return to the main menu...{Style.RESET_ALL}")
 
@@ -594,20 +3440,25 @@ class HermesMonitor:
             print(f"{Fore.CYAN}║{Style.RESET_ALL}             {Fore.YELLOW}SETTINGS{Style.RESET_ALL}                    {Fore.CYAN}║{Style.RESET_ALL}")
             print(f"{Fore.CYAN}╠══════════════════════════════════════════╣{Style.RESET_ALL}")
             print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}1.{Style.RESET_ALL} Save file: {self.save_file:<19}     {Fore.CYAN}║{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}2.{Style.RESET_ALL} Target username length: {self.target_length:<10}     {Fore.CYAN}║{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}2.{Style.RESET_ALL} Targets: {self.target_label[:24]:<25}     {Fore.CYAN}║{Style.RESET_ALL}")
             print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}3.{Style.RESET_ALL} Export found usernames                {Fore.CYAN}║{Style.RESET_ALL}")
             print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}4.{Style.RESET_ALL} Clear found usernames                 {Fore.CYAN}║{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}5.{Style.RESET_ALL} Lazy loading: {'on' if self.lazy_load else 'off':<19}     {Fore.CYAN}║{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}6.{Style.RESET_ALL} Selective decoding: {'on' if self.decoder.selective else 'off':<13}     {Fore.CYAN}║{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}7.{Style.RESET_ALL} Metrics: {self.metrics_target or 'off':<24}     {Fore.CYAN}║{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}8.{Style.RESET_ALL} Profiling: {self.profiler.output_dir if self.profiler.enabled else 'off':<22}     {Fore.CYAN}║{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}9.{Style.RESET_ALL} Keyword result cache: {'on' if self.response_cache.enabled else 'off':<11}     {Fore.CYAN}║{Style.RESET_ALL}")
             print(f"{Fore.CYAN}║{Style.RESET_ALL} {Fore.GREEN}0.{Style.RESET_ALL} Back to main menu                     {Fore.CYAN}║{Style.RESET_ALL}")
             print(f"{Fore.CYAN}╚══════════════════════════════════════════╝{Style.RESET_ALL}")
 
-            choice = input(f"\nEnter your choice (0-4): {Fore.GREEN}")
+            choice = input(f"\nEnter your choice (0-9): {Fore.GREEN}")
             print(Style.RESET_ALL, end="")
 
             if choice == "1":
                 new_file = input(f"\nEnter new save file name (current: {self.save_file}): {Fore.GREEN}")
                 print(Style.RESET_ALL, end="")
                 if new_file:
-                    self.save_file = new_file
+                    self._set_save_file(new_file)
             elif choice == "2":
                 self.change_target_length()
             elif choice == "3":
@@ -616,31 +3467,54 @@ class HermesMonitor:
                 confirm = input(f"\n{Fore.RED}Are you sure you want to clear all found usernames? (y/n): {Fore.GREEN}")
                 print(Style.RESET_ALL, end="")
                 if confirm.lower() == 'y':
-                    self.found_usernames = set()
-                    self.found_users = []
+                    self.store.clear()
                     print(f"\n{Fore.GREEN}All found usernames have been cleared.{Style.RESET_ALL}")
                     time.sleep(2)
+            elif choice == "5":
+                self._set_lazy_load(not self.lazy_load)
+            elif choice == "6":
+                self.decoder.selective = not self.decoder.selective
+            elif choice == "7":
+                target = input(f"\nMetrics port or file path (Enter to disable): {Fore.GREEN}")
+                print(Style.RESET_ALL, end="")
+                self.set_metrics_target(target.strip() or None)
+            elif choice == "8":
+                if self.profiler.enabled:
+                    self.profiler.disable()
+                else:
+                    output_dir = input(f"\nProfile output directory (default hermes_profiles): {Fore.GREEN}")
+                    print(Style.RESET_ALL, end="")
+                    try:
+                        every = int(input(f"\nDump cProfile/tracemalloc every N cycles (default 10): {Fore.GREEN}") or "10")
+                        print(Style.RESET_ALL, end="")
+                        self.profiler.enable(output_dir or "hermes_profiles", every)
+                    except ValueError:
+                        print(f"\n{Fore.RED}Invalid input. Please enter a number.{Style.RESET_ALL}")
+                        time.sleep(2)
+            elif choice == "9":
+                self.response_cache.enabled = not self.response_cache.enabled
+                self.response_cache.clear()
             elif choice == "0":
                 break
 
+    def write_export(self, export_file: Optional[str] = None, fmt: Optional[str] = None,
+                     since_last: Optional[str] = None) -> Tuple[str, int]:
+        fmt = fmt or (export_format(export_file) if export_file else "txt")
+        export_file = export_file or f"hermes_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+        watermark_file = os.path.splitext(self.save_file)[0] + ".export.json"
+        if "://" in self.save_file:
+            watermark_file = "hermes_remote.export.json"
+        return export_file, ResultExporter(self.store, watermark_file).export(export_file, fmt, since_last)
+
     def export_usernames(self) -> None:
+        fmt = input(f"\nFormat ({', '.join(EXPORT_FORMATS)}; default txt): {Fore.GREEN}").strip() or "txt"
+        print(Style.RESET_ALL, end="")
+        since = input(f"\nOnly usernames found since the last export? (y/n): {Fore.GREEN}")
+        print(Style.RESET_ALL, end="")
+
         try:
-            export_file = f"hermes_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-
-            with open(export_file, 'w') as f:
-                f.write(f"# Hermes TikTok Username Monitor - Export\n")
-                f.write(f"# Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"# Total usernames: {len(self.found_usernames)}\n\n")
-
-                for user in sorted(self.found_users, key=lambda x: x.followers, reverse=True):
-                    f.write(f"@{user.username}\n")
-                    f.write(f"Nickname: {user.nickname}\n")
-                    f.write(f"Followers: {user.followers}\n")
-                    f.write(f"Profile: {user.profile_url}\n")
-                    f.write(f"Discovered: {user.discovery_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write("-" * 40 + "\n")
-
-            print(f"\n{Fore.GREEN}Successfully exported to {export_file}{Style.RESET_ALL}")
+            export_file, count = self.write_export(fmt=fmt, since_last="menu" if since.lower() == 'y' else None)
+            print(f"\n{Fore.GREEN}Successfully exported {count} usernames to {export_file}{Style.RESET_ALL}")
         except Exception as e:
             print(f"\n{Fore.RED}Export failed: {str(e)}{Style.RESET_ALL}")
 
@@ -657,7 +3531,7 @@ class HermesMonitor:
         while True:
             self.display_menu()
 
-            choice = input(f"\n{Fore.YELLOW}Enter your choice (0-7): {Fore.GREEN}")
+            choice = input(f"\n{Fore.YELLOW}Enter your choice (0-9): {Fore.GREEN}")
             print(Style.RESET_ALL, end="")
 
             if choice == "1":
@@ -669,24 +3543,20 @@ class HermesMonitor:
                 print(f"{Fore.CYAN}╚══════════════════════════════════════════╝{Style.RESET_ALL}")
 
                 try:
-                    interval = int(input(f"\nCheck interval in seconds (default 60): {Fore.GREEN}") or "60")
+                    interval_input = input(f"\nCheck interval in seconds (Enter for adaptive): {Fore.GREEN}")
                     print(Style.RESET_ALL, end="")
+                    interval = int(interval_input) if interval_input else None
 
-                    print(f"\n{Fore.YELLOW}Starting monitor with {interval} second interval.{Style.RESET_ALL}")
+                    interval_label = f"{interval} second" if interval else "adaptive"
+                    print(f"\n{Fore.YELLOW}Starting monitor with {interval_label} interval.{Style.RESET_ALL}")
                     print(f"{Fore.YELLOW}Press Ctrl+C to stop monitoring.{Style.RESET_ALL}\n")
 
-                    self.running = True
-                    logger_thread = threading.Thread(target=self.logger_thread)
-                    logger_thread.daemon = True
-                    logger_thread.start()
-
+                    logger_thread = self._start_logger()
                     self.monitor_trending(interval)
-
-                    self.running = False
-                    logger_thread.join(timeout=2)
+                    self._stop_logger(logger_thread)
 
                 except ValueError:
-                    print(f"\n{Fore.RED}Invalid interval. Using default 60 seconds.{Style.RESET_ALL}")
+                    print(f"\n{Fore.RED}Invalid interval. Please enter a number of seconds.{Style.RESET_ALL}")
                     time.sleep(2)
 
                 input(f"\n{Fore.YELLOW}Press Enter to return to the main menu...{Style.RESET_ALL}")
@@ -706,24 +3576,23 @@ class HermesMonitor:
                     keywords = [k.strip() for k in keywords_input.split(',') if k.strip()]
 
                     try:
-                        interval = int(input(f"\nCheck interval in seconds (default 120): {Fore.GREEN}") or "120")
+                        interval_input = input(f"\nCheck interval in seconds (Enter for adaptive): {Fore.GREEN}")
+                        print(Style.RESET_ALL, end="")
+                        interval = int(interval_input) if interval_input else None
+                        self.concurrency = int(input(f"\nConcurrent searches (default {self.concurrency}): {Fore.GREEN}") or str(self.concurrency))
+                        print(Style.RESET_ALL, end="")
+                        self.max_pages = int(input(f"\nResult pages per keyword (default {self.max_pages}): {Fore.GREEN}") or str(self.max_pages))
                         print(Style.RESET_ALL, end="")
 
                         print(f"\n{Fore.YELLOW}Starting keyword search with keywords: {', '.join(keywords)}{Style.RESET_ALL}")
                         print(f"{Fore.YELLOW}Press Ctrl+C to stop monitoring.{Style.RESET_ALL}\n")
 
-                        self.running = True
-                        logger_thread = threading.Thread(target=self.logger_thread)
-                        logger_thread.daemon = True
-                        logger_thread.start()
-
+                        logger_thread = self._start_logger()
                         self.monitor_with_keywords(keywords, interval)
-
-                        self.running = False
-                        logger_thread.join(timeout=2)
+                        self._stop_logger(logger_thread)
 
                     except ValueError:
-                        print(f"\n{Fore.RED}Invalid interval. Using default 120 seconds.{Style.RESET_ALL}")
+                        print(f"\n{Fore.RED}Invalid interval. Please enter a number of seconds.{Style.RESET_ALL}")
                         time.sleep(2)
                 else:
                     print(f"\n{Fore.RED}No keywords entered.{Style.RESET_ALL}")
@@ -765,10 +3634,71 @@ class HermesMonitor:
             elif choice == "7":
                 self.display_settings()
 
+            elif choice == "8":
+                os.system('cls' if os.name == 'nt' else 'clear')
+                self.display_logo()
+
+                print(f"{Fore.CYAN}╔══════════════════════════════════════════╗{Style.RESET_ALL}")
+                print(f"{Fore.CYAN}║{Style.RESET_ALL}      {Fore.YELLOW}MONITOR ALL SOURCES CONCURRENTLY{Style.RESET_ALL}    {Fore.CYAN}║{Style.RESET_ALL}")
+                print(f"{Fore.CYAN}╚══════════════════════════════════════════╝{Style.RESET_ALL}")
+
+                keywords_input = input(f"\nEnter keywords separated by commas (or press Enter to skip): {Fore.GREEN}")
+                print(Style.RESET_ALL, end="")
+                keywords = [k.strip() for k in keywords_input.split(',') if k.strip()]
+
+                try:
+                    interval_input = input(f"\nCheck interval in seconds (Enter for adaptive): {Fore.GREEN}")
+                    print(Style.RESET_ALL, end="")
+                    interval = int(interval_input) if interval_input else None
+
+                    print(f"\n{Fore.YELLOW}Starting trending, suggested{' and keyword' if keywords else ''} monitors.{Style.RESET_ALL}")
+                    print(f"{Fore.YELLOW}Press Ctrl+C to stop monitoring.{Style.RESET_ALL}\n")
+
+                    logger_thread = self._start_logger()
+                    self.monitor_sources(["trending", "keywords", "suggested"], keywords, interval)
+                    self._stop_logger(logger_thread)
+
+                except ValueError:
+                    print(f"\n{Fore.RED}Invalid interval. Please enter a number of seconds.{Style.RESET_ALL}")
+                    time.sleep(2)
+
+                input(f"\n{Fore.YELLOW}Press Enter to return to the main menu...{Style.RESET_ALL}")
+
+            elif choice == "9":
+                os.system('cls' if os.name == 'nt' else 'clear')
+                self.display_logo()
+
+                print(f"{Fore.CYAN}╔══════════════════════════════════════════╗{Style.RESET_ALL}")
+                print(f"{Fore.CYAN}║{Style.RESET_ALL}       {Fore.YELLOW}AUTO-SCHEDULE BY YIELD{Style.RESET_ALL}             {Fore.CYAN}║{Style.RESET_ALL}")
+                print(f"{Fore.CYAN}╚══════════════════════════════════════════╝{Style.RESET_ALL}")
+
+                keywords_input = input(f"\nEnter keywords separated by commas (or press Enter to skip): {Fore.GREEN}")
+                print(Style.RESET_ALL, end="")
+                keywords = [k.strip() for k in keywords_input.split(',') if k.strip()]
+
+                try:
+                    budget_input = input(f"\nRequests per second across all sources (default {self.requests_per_second}): {Fore.GREEN}")
+                    print(Style.RESET_ALL, end="")
+                    self.requests_per_second = float(budget_input) if budget_input else self.requests_per_second
+
+                    print(f"\n{Fore.YELLOW}Scheduling trending, suggested{' and keyword' if keywords else ''} checks by hits per request.{Style.RESET_ALL}")
+                    print(f"{Fore.YELLOW}Press Ctrl+C to stop monitoring.{Style.RESET_ALL}\n")
+
+                    logger_thread = self._start_logger()
+                    self.monitor_scheduled(["trending", "suggested", "keywords"], keywords)
+                    self._stop_logger(logger_thread)
+
+                except ValueError:
+                    print(f"\n{Fore.RED}Invalid budget. Please enter a number.{Style.RESET_ALL}")
+                    time.sleep(2)
+
+                input(f"\n{Fore.YELLOW}Press Enter to return to the main menu...{Style.RESET_ALL}")
+
             elif choice == "0":
                 os.system('cls' if os.name == 'nt' else 'clear')
                 self.display_logo()
                 print(f"\n{Fore.YELLOW}Thank you for using Hermes TikTok Username Monitor!{Style.RESET_ALL}")
+                self.store.close()
                 time.sleep(1)
                 break
 
@@ -776,11 +3706,245 @@ class HermesMonitor:
                 print(f"\n{Fore.RED}Invalid choice. Please try again.{Style.RESET_ALL}")
                 time.sleep(1)
 
-def main():
+CLI_DEFAULTS = {
+    "save_file": "hermes_found_usernames.json",
+    "length": 4,
+    "targets": None,
+    "proxies": None,
+    "interval": None,
+    "keywords": [],
+    "concurrency": 1,
+    "requests_per_second": 0.5,
+    "max_pages": 3,
+    "sources": ["trending", "suggested", "keywords"],
+    "workers": None,
+    "listen": "127.0.0.1:0",
+    "lazy": False,
+    "metrics": None,
+    "profile_dir": None,
+    "once": False,
+    "no_cache": False,
+    "retries": 3,
+    "breaker_threshold": 5,
+    "breaker_reset": 30.0,
+    "output": None,
+    "format": None,
+    "since_last": None,
+    "prefix": "",
+    "log_level": "info",
+    "log_file": None,
+    "log_format": "text",
+    "quiet": False
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    import argparse
+
+    common = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    common.add_argument("--config", help="JSON file whose keys match the long option names")
+    common.add_argument("--save-file", help="results file (.json journal or .db SQLite)")
+    common.add_argument("--length", type=int, choices=(3, 4, 5), help="target username length")
+    common.add_argument("--targets", help="comma-separated target specs, e.g. 3-5 or 4,5:letters,4:repeated "
+                                          f"(patterns: {', '.join(TARGET_PATTERNS)})")
+    common.add_argument("--proxies", help="proxy file, one ip:port[:user:pass] per line")
+    common.add_argument("--lazy", action="store_true", help="keep only usernames in memory")
+    common.add_argument("--metrics", help="port to serve /metrics on, or a file to write it to")
+    common.add_argument("--profile-dir", help="write per-cycle profiles to this directory")
+    common.add_argument("--log-level", choices=tuple(LOG_LEVELS), help="lowest level to log (default info)")
+    common.add_argument("--log-file", help="also write logs to this file, rotated at 10 MB")
+    common.add_argument("--log-format", choices=("text", "json"), help="log file format (default text)")
+    common.add_argument("--quiet", action="store_true", help="do not log to the console")
+    common.add_argument("--retries", type=int, help="attempts per request on 5xx and network errors (default 3)")
+    common.add_argument("--breaker-threshold", type=int,
+                        help="consecutive failures that open an endpoint's circuit (default 5)")
+    common.add_argument("--breaker-reset", type=float, help="seconds an open circuit waits before a probe (default 30)")
+
+    monitor = argparse.ArgumentParser(add_help=False, argument_default=argparse.SUPPRESS)
+    monitor.add_argument("--interval", type=int, help="seconds between checks (default: adaptive)")
+    monitor.add_argument("--once", action="store_true", help="run a single check and exit")
+
+    parser = argparse.ArgumentParser(prog="hermes", description="Hermes TikTok Username Monitor. "
+                                     "Run without arguments for the interactive menu.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("trending", parents=[common, monitor], help="monitor the trending feed")
+    keywords = subparsers.add_parser("keywords", parents=[common, monitor], help="monitor keyword searches")
+    keywords.add_argument("keywords", nargs="*", default=argparse.SUPPRESS, help="keywords to search for")
+    keywords.add_argument("--concurrency", type=int, default=argparse.SUPPRESS, help="concurrent searches")
+    keywords.add_argument("--requests-per-second", type=float, default=argparse.SUPPRESS,
+                          help="shared request budget for concurrent searches")
+    keywords.add_argument("--no-cache", action="store_true", default=argparse.SUPPRESS,
+                          help="re-query every keyword each round even if its results are unchanged")
+    suggested = subparsers.add_parser("suggested", parents=[common, monitor], help="monitor suggested users")
+    auto = subparsers.add_parser("auto", parents=[common, monitor],
+                                 help="spend requests on the sources and keywords with the best recent yield")
+    auto.add_argument("keywords", nargs="*", default=argparse.SUPPRESS, help="keywords to search for")
+    auto.add_argument("--sources", nargs="+", choices=("trending", "suggested", "keywords"), default=argparse.SUPPRESS,
+                      help="sources to schedule (default: all)")
+    auto.add_argument("--requests-per-second", type=float, default=argparse.SUPPRESS,
+                      help="shared request budget across all sources")
+    auto.add_argument("--no-cache", action="store_true", default=argparse.SUPPRESS,
+                      help="re-query every keyword even if its results are unchanged")
+    coordinate = subparsers.add_parser("coordinate", parents=[common],
+                                       help="shard sources and keywords across worker processes sharing one store")
+    coordinate.add_argument("--interval", type=int, default=argparse.SUPPRESS,
+                            help="seconds between each worker's checks (default: adaptive)")
+    coordinate.add_argument("keywords", nargs="*", default=argparse.SUPPRESS, help="keywords to search for")
+    coordinate.add_argument("--sources", nargs="+", choices=("trending", "suggested", "keywords"),
+                            default=argparse.SUPPRESS, help="sources to shard (default: all)")
+    coordinate.add_argument("--workers", type=int, default=argparse.SUPPRESS,
+                            help="local worker processes to start (default: CPU count, 0 for remote workers only)")
+    coordinate.add_argument("--listen", default=argparse.SUPPRESS,
+                            help="host:port for workers to connect to (default 127.0.0.1 on a free port)")
+    coordinate.add_argument("--requests-per-second", type=float, default=argparse.SUPPRESS,
+                            help="request budget for each worker")
+    worker = subparsers.add_parser("worker", parents=[common],
+                                   help="crawl the shard a coordinator assigns, sharing its result store")
+    worker.add_argument("coordinator", help="coordinator URL, e.g. http://10.0.0.5:8765")
+    for paged in (keywords, suggested, auto, coordinate):
+        paged.add_argument("--max-pages", type=int, default=argparse.SUPPRESS,
+                           help="follow the result cursor up to this many pages per check (default 3)")
+    coverage = subparsers.add_parser("coverage", parents=[common], help="show how much of the 3-5 character space was found")
+    coverage.add_argument("--prefix", default=argparse.SUPPRESS, help="only count usernames starting with this prefix")
+    export = subparsers.add_parser("export", parents=[common], help="export found usernames and exit")
+    export.add_argument("--output", default=argparse.SUPPRESS,
+                        help="export file; its extension picks the format (default: timestamped .txt)")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default=argparse.SUPPRESS,
+                        help="export format (default: from --output, else txt)")
+    export.add_argument("--since-last", nargs="?", const="default", default=argparse.SUPPRESS, metavar="NAME",
+                        help="only export usernames found since the last export with this name")
+    return parser
+
+
+def load_cli_settings(argv: List[str]) -> Dict[str, Any]:
+    args = vars(build_parser().parse_args(argv))
+
+    config = {}
+    if args.get("config"):
+        with open(args["config"], 'r') as f:
+            config = {key.replace('-', '_'): value for key, value in json.load(f).items()}
+
+    return {**CLI_DEFAULTS, **config, **args}
+
+
+def run_headless(argv: List[str]) -> int:
+    import signal
+
+    try:
+        settings = load_cli_settings(argv)
+    except (OSError, ValueError) as e:
+        print(f"Failed to read config: {str(e)}", file=sys.stderr)
+        return 2
+
+    command = settings["command"]
+    try:
+        targets = TargetSpec.parse(settings["targets"] or [str(settings["length"])])
+    except ValueError as e:
+        print(f"Invalid targets: {str(e)}", file=sys.stderr)
+        return 2
+
+    if command == "keywords" and not settings["keywords"]:
+        print("No keywords given (pass them as arguments or set \"keywords\" in the config)", file=sys.stderr)
+        return 2
+    if command in ("auto", "coordinate") and not settings["keywords"] and set(settings["sources"]) <= {"keywords"}:
+        print("Nothing to schedule: --sources keywords needs keywords "
+              "(pass them as arguments or set \"keywords\" in the config)", file=sys.stderr)
+        return 2
+
+    save_file = settings["coordinator"] if command == "worker" else settings["save_file"]
+    monitor = HermesMonitor(save_file, lazy_load=settings["lazy"])
+    try:
+        monitor.logger.level = settings["log_level"]
+        if settings["quiet"]:
+            monitor.logger.console = None
+        if settings["log_file"]:
+            monitor.logger.add_file(settings["log_file"], settings["log_format"])
+    except (OSError, ValueError) as e:
+        print(f"Failed to set up logging: {str(e)}", file=sys.stderr)
+        monitor.store.close()
+        return 2
+    monitor.set_target_specs(targets)
+    monitor.concurrency = settings["concurrency"]
+    monitor.requests_per_second = settings["requests_per_second"]
+    monitor.max_pages = settings["max_pages"]
+    monitor.response_cache.enabled = not settings["no_cache"]
+    monitor.retry_policy = RetryPolicy(max(1, settings["retries"]))
+    monitor.circuit_breaker = CircuitBreaker(max(1, settings["breaker_threshold"]), settings["breaker_reset"])
+
+    logger_thread = monitor._start_logger()
+    signal.signal(signal.SIGTERM, lambda signum, frame: monitor.stop())
+
     try:
+        if settings["proxies"]:
+            monitor.load_proxies_from_file(settings["proxies"])
+        if settings["metrics"]:
+            monitor.set_metrics_target(str(settings["metrics"]))
+        if settings["profile_dir"]:
+            monitor.profiler.enable(settings["profile_dir"])
+
+        if command == "coverage":
+            for line in monitor.coverage_report(settings["prefix"].lower()):
+                monitor.log(line)
+        elif command == "export":
+            export_file, count = monitor.write_export(settings["output"], settings["format"], settings["since_last"])
+            monitor.log(f"Exported {count} usernames to {export_file}", level="success")
+        elif settings["once"]:
+            sources = settings["sources"] if command == "auto" else [command]
+            if "trending" in sources:
+                monitor._report_found(monitor.check_trending_posts())
+            if "suggested" in sources:
+                monitor._report_found(monitor.check_suggested_users(), " in suggested users")
+            if "keywords" in sources:
+                for keyword in settings["keywords"]:
+                    monitor._report_found(monitor.check_search_results(keyword), f" for '{keyword}'")
+        elif command == "trending":
+            monitor.monitor_trending(settings["interval"])
+        elif command == "suggested":
+            monitor.monitor_suggested(settings["interval"])
+        elif command == "auto":
+            monitor.monitor_scheduled(settings["sources"], settings["keywords"], settings["interval"])
+        elif command == "coordinate":
+            host, _, port = settings["listen"].rpartition(':')
+            workers = settings["workers"] if settings["workers"] is not None else os.cpu_count() or 1
+            coordinator = Coordinator(monitor, settings["sources"], settings["keywords"], workers, settings)
+            coordinator.run(workers, host or "127.0.0.1", int(port or 0))
+        elif command == "worker":
+            shard = monitor.store.register()
+            monitor.set_target_specs(TargetSpec.parse(shard["targets"]))
+            monitor.max_pages = shard["max_pages"]
+            monitor.requests_per_second = shard["requests_per_second"]
+            monitor.log(f"Registered as worker {shard['worker']}: {', '.join(shard['sources'])}", level="info")
+            def released() -> None:
+                monitor.log("The coordinator gave this worker's shard to another worker, stopping", level="warning")
+                monitor.stop()
+
+            monitor.store.report_every(monitor.stats, on_released=released)
+            monitor.monitor_scheduled(shard["sources"], shard["keywords"], shard["interval"])
+        else:
+            monitor.monitor_with_keywords(settings["keywords"], settings["interval"])
+    except KeyboardInterrupt:
+        monitor.log("Stopped by user", level="warning")
+    except Exception as e:
+        monitor.log(f"An error occurred: {str(e)}", level="error")
+        return 1
+    finally:
+        monitor.metrics.stop()
+        monitor.profiler.disable()
+        monitor.store.close()
+        monitor._stop_logger(logger_thread)
+        monitor.logger.close()
+
+    return 0
 
-        init(autoreset=True)
 
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        return run_headless(argv)
+
+    init_colors()
+
+    try:
         monitor = HermesMonitor()
         monitor.start()
 
@@ -788,6 +3952,7 @@ def main():
         print(f"\n{Fore.YELLOW}Program terminated by user.{Style.RESET_ALL}")
     except Exception as e:
         print(f"\n{Fore.RED}An error occurred: {str(e)}{Style.RESET_ALL}")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import random
+import string
+
+from main import MemoryResultStore, UserAccount
+
+
+def test_compaction_during_flushes_keeps_every_record(tmp_path):
+    save_file = str(tmp_path / "found.json")
+    store = MemoryResultStore(save_file)
+    store.load()
+    store.journal.compact_every = 50
+
+    rng = random.Random(7)
+    added = set()
+    while len(added) < 300:
+        username = "".join(rng.choices(string.ascii_lowercase, k=5))
+        if store.add(UserAccount(username, followers=rng.randrange(1000))):
+            added.add(username)
+        store.flush()
+    store.close()
+
+    reloaded = MemoryResultStore(save_file)
+    reloaded.load()
+    try:
+        assert len(reloaded) == len(added)
+        assert {user.username for user in reloaded.iter_by_followers()} == added
+    finally:
+        reloaded.close()